@@ -1,5 +1,7 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import PAGE_VAR
 from .models import CompanyInfo, JobPosition, Profile, JobApplication
+from .pagination import EstimatedCountPaginator
 
 class CompanyInfoAdmin(admin.ModelAdmin):
     list_display = ('name', 'email', 'phone', 'updated_at')
@@ -16,7 +18,54 @@ class CompanyInfoAdmin(admin.ModelAdmin):
         }),
     )
 
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist settings for tables with millions of rows: estimated totals,
+    no second COUNT(*) for "Show all", and searchable foreign keys instead of
+    dropdowns of every row.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        # Counting starts at the requested page, so the pages after it are
+        # linked however deep into a filtered listing it is.
+        try:
+            page = max(int(request.GET.get(PAGE_VAR, 1)), 1)
+        except ValueError:
+            page = 1
+        return self.paginator(
+            queryset, per_page, orphans, allow_empty_first_page, first_row=(page - 1) * per_page
+        )
+
+
+class JobPositionAdmin(LargeTableAdmin):
+    list_display = ('title', 'posted_by', 'status', 'job_type', 'location', 'application_deadline', 'created_at')
+    list_select_related = ('posted_by',)
+    list_filter = ('status',)
+    search_fields = ('title',)
+    autocomplete_fields = ('posted_by',)
+    ordering = ('-id',)
+
+
+class JobApplicationAdmin(LargeTableAdmin):
+    list_display = ('full_name', 'job', 'applicant', 'status', 'is_active', 'submitted_at')
+    list_select_related = ('job', 'applicant')
+    list_filter = ('status',)
+    date_hierarchy = 'submitted_at'
+    autocomplete_fields = ('job', 'applicant')
+    ordering = ('-submitted_at',)
+
+
+class ProfileAdmin(LargeTableAdmin):
+    list_display = ('user', 'role')
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
+    ordering = ('-id',)
+
+
 admin.site.register(CompanyInfo, CompanyInfoAdmin)
-admin.site.register(JobPosition)
-admin.site.register(Profile)
-admin.site.register(JobApplication)
+admin.site.register(JobPosition, JobPositionAdmin)
+admin.site.register(Profile, ProfileAdmin)
+admin.site.register(JobApplication, JobApplicationAdmin)
@@ -0,0 +1,137 @@
+"""
+Cold storage for closed jobs and withdrawn applications.
+
+archive_records moves rows older than a cutoff into ArchivedJobApplication
+and ArchivedJobPosition. Each batch is copied and deleted in its own short
+transaction, so writers on the hot tables never wait for more than one
+batch. Applications go first; a closed job follows once it has none left.
+
+Archived applications keep their stored files: the reference held by the
+hot row passes to the archive row and is released when that is deleted.
+"""
+import contextlib
+import contextvars
+import json
+import time
+import zlib
+
+from django.db import models, transaction
+from django.db.models import Count, Exists, OuterRef, Q
+
+from .models import ArchivedJobApplication, ArchivedJobPosition, JobApplication, JobPosition
+
+BATCH_SIZE = 500
+
+_archiving = contextvars.ContextVar("archiving", default=False)
+
+
+def is_archiving():
+    """
+    True while rows are being moved to the archive, so delete signals can
+    tell a move from a real deletion.
+    """
+    return _archiving.get()
+
+
+@contextlib.contextmanager
+def _moving():
+    token = _archiving.set(True)
+    try:
+        yield
+    finally:
+        _archiving.reset(token)
+
+
+def pack(instance):
+    """
+    Returns the row as zlib-compressed JSON, every value a string. Binary
+    columns hold derived data (MinHash signatures) and are left out.
+    """
+    row = {
+        field.attname: field.value_to_string(instance)
+        for field in instance._meta.concrete_fields
+        if not isinstance(field, models.BinaryField)
+    }
+    return zlib.compress(json.dumps(row, separators=(",", ":")).encode())
+
+
+def _archive_applications(applications):
+    ArchivedJobApplication.objects.bulk_create(
+        ArchivedJobApplication(
+            id=application.pk,
+            job_id=application.job_id,
+            job_title=application.job.title,
+            applicant_id=application.applicant_id,
+            status=application.status,
+            is_active=application.is_active,
+            submitted_at=application.submitted_at,
+            payload=pack(application),
+        )
+        for application in applications
+    )
+
+
+def _archive_jobs(jobs):
+    counts = dict(
+        ArchivedJobApplication.objects.filter(job_id__in=[job.pk for job in jobs])
+        .values_list("job_id")
+        .annotate(Count("id"))
+    )
+    ArchivedJobPosition.objects.bulk_create(
+        ArchivedJobPosition(
+            id=job.pk,
+            posted_by_id=job.posted_by_id,
+            title=job.title,
+            created_at=job.created_at,
+            application_count=counts.get(job.pk, 0),
+            payload=pack(job),
+        )
+        for job in jobs
+    )
+
+
+def _move(queryset, archive, batch_size, pause):
+    """
+    Archives and deletes `queryset` in primary-key order, one transaction
+    per batch. Returns the number of rows moved.
+    """
+    moved = 0
+    while True:
+        with transaction.atomic(), _moving():
+            # Locked rows cannot be edited, or gain applications, until the
+            # batch commits, so the archived copy is the final one.
+            ids = list(
+                queryset.select_for_update(of=("self",))
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                return moved
+            # Rows that stopped matching before the lock was taken (e.g. a
+            # job that took an application) are checked again and skipped.
+            batch = list(queryset.filter(pk__in=ids).order_by("pk"))
+            archive(batch)
+            queryset.filter(pk__in=[row.pk for row in batch]).delete()
+        moved += len(batch)
+        if pause:
+            time.sleep(pause)
+
+
+def archive_records(cutoff, batch_size=BATCH_SIZE, pause=0):
+    """
+    Archives withdrawn applications submitted before `cutoff`, then closed
+    jobs created before it together with their applications. Returns
+    (jobs, applications) moved.
+    """
+    old_closed_jobs = JobPosition.objects.filter(status="Closed", created_at__lt=cutoff)
+    applications = JobApplication.objects.filter(
+        Q(is_active=False, submitted_at__lt=cutoff) | Q(job__in=old_closed_jobs)
+    ).select_related("job")
+    application_count = _move(applications, _archive_applications, batch_size, pause)
+    # A job that took an application after the sweep above stays until the
+    # next run; deleting it here would cascade to that application.
+    jobs = old_closed_jobs.filter(
+        ~Exists(JobApplication.objects.filter(job=OuterRef("pk")))
+    )
+    job_count = _move(jobs, _archive_jobs, batch_size, pause)
+    return job_count, application_count
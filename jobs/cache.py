@@ -0,0 +1,138 @@
+import functools
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+COMPANY_INFO_KEY = "jobs:company_info"
+# Signals clear the key in the process that saved the row; the timeout bounds
+# staleness in other processes when the cache is not shared between them.
+COMPANY_INFO_TIMEOUT = 60 * 60
+
+_MISSING = object()
+
+
+def get_company_info():
+    """
+    Returns the site's CompanyInfo (or None) from the cache, loading it on a miss.
+    """
+    from .models import CompanyInfo
+
+    company_info = cache.get(COMPANY_INFO_KEY, _MISSING)
+    if company_info is _MISSING:
+        company_info = CompanyInfo.objects.first()
+        cache.set(COMPANY_INFO_KEY, company_info, COMPANY_INFO_TIMEOUT)
+    return company_info
+
+
+def invalidate_company_info():
+    cache.delete(COMPANY_INFO_KEY)
+
+
+# Anonymous pages are cached whole. Keys carry a generation number so a
+# CompanyInfo change, which shows on every page, can drop them all at once.
+PAGE_GENERATION_KEY = "jobs:pages:generation"
+PAGE_TIMEOUT = 10 * 60
+
+
+def _page_generation():
+    generation = cache.get(PAGE_GENERATION_KEY)
+    if generation is None:
+        generation = 1
+        cache.add(PAGE_GENERATION_KEY, generation, None)
+    return generation
+
+
+async def _apage_generation():
+    generation = await cache.aget(PAGE_GENERATION_KEY)
+    if generation is None:
+        generation = 1
+        await cache.aadd(PAGE_GENERATION_KEY, generation, None)
+    return generation
+
+
+def page_key(name, generation=None):
+    return f"jobs:pages:{generation or _page_generation()}:{name}"
+
+
+def _has_messages(request):
+    # Messages live in a cookie or the session, so without cookies there are none.
+    return bool(request.COOKIES) and bool(len(get_messages(request)))
+
+
+def _shareable(request, user):
+    return request.method == "GET" and not request.GET and not user.is_authenticated
+
+
+def cache_anonymous_page(name):
+    """
+    Serves the decorated view from the cache for anonymous GET requests
+    without a query string. `name` is a format string filled in from the
+    view's keyword arguments, e.g. "job:{job_id}". Works on sync and async
+    views.
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @functools.wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                user = await request.auser()
+                # request.user caches separately; share the loaded user with
+                # the view and its templates.
+                request.user = user
+                # Pages carrying flash messages or user state are never shared.
+                if not _shareable(request, user) or (
+                    await sync_to_async(_has_messages)(request)
+                ):
+                    return await view(request, *args, **kwargs)
+                key = page_key(name.format(**kwargs), await _apage_generation())
+                content = await cache.aget(key)
+                if content is None:
+                    response = await view(request, *args, **kwargs)
+                    if response.status_code == 200:
+                        await cache.aset(key, response.content, PAGE_TIMEOUT)
+                else:
+                    response = HttpResponse(content)
+                patch_vary_headers(response, ["Cookie"])
+                return response
+
+            return async_wrapper
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _shareable(request, request.user) or _has_messages(request):
+                return view(request, *args, **kwargs)
+            key = page_key(name.format(**kwargs))
+            content = cache.get(key)
+            if content is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code == 200:
+                    cache.set(key, response.content, PAGE_TIMEOUT)
+            else:
+                response = HttpResponse(content)
+            patch_vary_headers(response, ["Cookie"])
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_job_pages(*job_ids):
+    generation = _page_generation()
+    cache.delete_many(
+        [page_key("home", generation)]
+        + [page_key(f"job:{job_id}", generation) for job_id in job_ids]
+    )
+
+
+def invalidate_pages():
+    try:
+        cache.incr(PAGE_GENERATION_KEY)
+    except ValueError:
+        # The generation was evicted; every key built from it is unreachable.
+        pass
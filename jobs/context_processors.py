@@ -1,8 +1,7 @@
-from .models import CompanyInfo
+from .cache import get_company_info
 
 def company_info_processor(request):
     """
     Makes the company information available to all templates.
     """
-    company_info = CompanyInfo.objects.first()
-    return {'company_info': company_info}
+    return {'company_info': get_company_info()}
@@ -0,0 +1,119 @@
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from django.core.files.storage import default_storage
+
+from .models import CVDocument
+from .tasks import enqueue
+
+MAX_TEXT_LENGTH = 200_000
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class ExtractionError(Exception):
+    pass
+
+
+def _pdf_text(source):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ExtractionError("pypdf is not installed")
+    try:
+        reader = PdfReader(source)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    except Exception as exc:
+        # pypdf raises a wide range of errors on malformed files.
+        raise ExtractionError(f"Unreadable PDF: {exc}")
+
+
+def _docx_text(source):
+    try:
+        with zipfile.ZipFile(source) as archive:
+            root = ElementTree.fromstring(archive.read("word/document.xml"))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise ExtractionError(f"Unreadable DOCX: {exc}")
+    paragraphs = []
+    for paragraph in root.iter(f"{WORD_NAMESPACE}p"):
+        paragraphs.append("".join(node.text or "" for node in paragraph.iter(f"{WORD_NAMESPACE}t")))
+    return "\n".join(paragraphs)
+
+
+def _doc_text(source):
+    # Legacy Word files store their text as runs of UTF-16LE or 8-bit
+    # characters; pulling out long printable runs is enough for search.
+    data = source.read()
+    runs = re.findall(rb"(?:[\x20-\x7e]\x00){4,}", data)
+    if runs:
+        return "\n".join(run.decode("utf-16-le") for run in runs)
+    return "\n".join(run.decode("latin-1") for run in re.findall(rb"[\x20-\x7e]{4,}", data))
+
+
+EXTRACTORS = {".pdf": _pdf_text, ".docx": _docx_text, ".doc": _doc_text}
+
+
+def extract_text(name):
+    """
+    Returns the plain text of the stored CV `name`.
+    Raises ExtractionError when the file type is unsupported or unreadable.
+    """
+    extractor = EXTRACTORS.get(os.path.splitext(name)[1].lower())
+    if extractor is None:
+        raise ExtractionError("Unsupported file type")
+    with default_storage.open(name) as source:
+        text = extractor(source)
+    return " ".join(text.split())[:MAX_TEXT_LENGTH]
+
+
+def extract_result(name):
+    """
+    Returns (name, text, error) for `name`; safe to run in a worker process.
+    """
+    try:
+        return name, extract_text(name), ""
+    except (ExtractionError, OSError) as exc:
+        return name, "", str(exc)[:255]
+
+
+def index_cv(name):
+    """
+    Extracts `name` once and stores the text for search.
+    """
+    if not name or CVDocument.objects.filter(file_name=name).exists():
+        return
+    name, text, error = extract_result(name)
+    # A single INSERT OR IGNORE; a concurrent extraction of the same file wins.
+    CVDocument.objects.bulk_create(
+        [CVDocument(file_name=name, text=text, error=error)], ignore_conflicts=True
+    )
+
+
+def queue_cv_extraction(name):
+    if name:
+        enqueue(index_cv, name)
+
+
+def pending_cv_names():
+    """
+    Returns the CV files referenced by applications or profiles that have
+    not been extracted yet.
+    """
+    from .models import JobApplication, Profile
+
+    extracted = CVDocument.objects.values("file_name")
+    names = set(
+        JobApplication.objects.exclude(cv_file="")
+        .exclude(cv_file__in=extracted)
+        .values_list("cv_file", flat=True)
+        .distinct()
+    )
+    names.update(
+        Profile.objects.exclude(cv="")
+        .exclude(cv__isnull=True)
+        .exclude(cv__in=extracted)
+        .values_list("cv", flat=True)
+        .distinct()
+    )
+    return sorted(names)
@@ -0,0 +1,45 @@
+"""
+Closing job postings whose application deadline has passed.
+
+close_expired_jobs finds expired open jobs through the (status,
+application_deadline) index and closes them with one UPDATE per batch. Each
+batch reads only the rows it closes, so a run costs the same however many
+postings are still open, and no transaction outlives a batch.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate_job_pages
+from .models import JobPosition
+
+BATCH_SIZE = 1000
+
+
+def is_expired(job, today=None):
+    """
+    True once the deadline day is over. Applications are taken on the day
+    itself.
+    """
+    return job.application_deadline < (today or timezone.localdate())
+
+
+def close_expired_jobs(today=None, batch_size=BATCH_SIZE):
+    """
+    Closes every open job with a deadline before `today` and drops the
+    cached pages that show them. Returns the number of jobs closed.
+    """
+    expired = JobPosition.objects.filter(
+        status="Open", application_deadline__lt=today or timezone.localdate()
+    )
+    closed = 0
+    while True:
+        with transaction.atomic():
+            ids = list(expired.values_list("pk", flat=True)[:batch_size])
+            if ids:
+                # The status test repeats the filter for jobs reopened meanwhile.
+                closed += expired.filter(pk__in=ids).update(status="Closed")
+        if ids:
+            # update() sends no post_save, so the page cache is cleared here.
+            invalidate_job_pages(*ids)
+        if len(ids) < batch_size:
+            return closed
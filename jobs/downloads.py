@@ -0,0 +1,167 @@
+"""
+Sending protected media (CVs and application documents) after a permission
+check.
+
+PROTECTED_MEDIA_SERVER picks how the bytes leave:
+
+- "x-accel-redirect": nginx serves the file from an internal location
+  mapped to MEDIA_ROOT at PROTECTED_MEDIA_INTERNAL_URL.
+- "x-sendfile": Apache (mod_xsendfile) or lighttpd serves the absolute path.
+- "django" (default): Django answers conditional GETs and single byte
+  ranges itself; whole files go out through the server's file wrapper
+  (sendfile where available). Under ASGI the file is read in a worker
+  thread chunk by chunk, as a sync iterator would be read whole first.
+
+The front server handles Range and conditional requests in the first two.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.static import serve
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+def _disposition(filename, attachment):
+    kind = "attachment" if attachment else "inline"
+    return f"{kind}; filename*=UTF-8''{quote(filename)}"
+
+
+def _content_type(filename):
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+
+def _byte_range(header, size):
+    """
+    Returns (start, end) for a single "bytes=" range, None to send the whole
+    file, or False when the range cannot be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        # RFC 9110 14.2: an invalid range such as "bytes=5-3" is ignored.
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # "bytes=-N" is the last N bytes.
+        if not int(last):
+            return False
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size:
+        return False
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+async def _aread_range(path, start, length):
+    chunks = _read_range(path, start, length)
+    read = sync_to_async(next, thread_sensitive=False)
+    try:
+        while (chunk := await read(chunks, None)) is not None:
+            yield chunk
+    finally:
+        chunks.close()
+
+
+def _stream(request, path, stat, filename, attachment):
+    etag = quote_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        return response
+
+    byte_range = None
+    if "Range" in request.headers:
+        # A stale If-Range means the client's partial copy is outdated.
+        if_range = request.headers.get("If-Range")
+        if if_range is None or if_range == etag:
+            byte_range = _byte_range(request.headers["Range"], stat.st_size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{stat.st_size}"
+        return response
+    is_asgi = isinstance(request, ASGIRequest)
+    if byte_range or is_asgi:
+        start, end = byte_range or (0, stat.st_size - 1)
+        read = _aread_range if is_asgi else _read_range
+        response = StreamingHttpResponse(
+            read(path, start, end - start + 1), status=206 if byte_range else 200
+        )
+        if byte_range:
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Type"] = _content_type(filename)
+    else:
+        response = FileResponse(open(path, "rb"), filename=filename)
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Content-Disposition"] = _disposition(filename, attachment)
+    return response
+
+
+def serve_protected(request, field_file, attachment=False):
+    """
+    Returns a response that sends `field_file` to a client already allowed
+    to read it.
+    """
+    if not field_file:
+        raise Http404("No file.")
+    path = field_file.path
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404("File not found.")
+    filename = os.path.basename(field_file.name)
+
+    server = getattr(settings, "PROTECTED_MEDIA_SERVER", "django")
+    if server == "django":
+        return _stream(request, path, stat, filename, attachment)
+
+    response = HttpResponse(content_type=_content_type(filename))
+    if server == "x-accel-redirect":
+        internal_url = settings.PROTECTED_MEDIA_INTERNAL_URL.rstrip("/")
+        response["X-Accel-Redirect"] = f"{internal_url}/{quote(field_file.name)}"
+    elif server == "x-sendfile":
+        response["X-Sendfile"] = path
+    else:
+        raise ValueError(f"Unknown PROTECTED_MEDIA_SERVER {server!r}.")
+    response["Content-Disposition"] = _disposition(filename, attachment)
+    return response
+
+
+def serve_public_media(request, path):
+    """
+    Development-only view for MEDIA_ROOT that refuses the protected folders.
+    The path is normalised first: serve() would otherwise resolve
+    "/media//cvs/..." or "/media/x/../cvs/..." into them.
+    """
+    path = posixpath.normpath(path).lstrip("/")
+    # Lowercased for case-insensitive filesystems.
+    if path.lower().startswith(settings.PROTECTED_MEDIA_PREFIXES):
+        raise Http404("File not found.")
+    return serve(request, path, document_root=settings.MEDIA_ROOT)
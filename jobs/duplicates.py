@@ -0,0 +1,212 @@
+"""
+Near-duplicate detection for job applications.
+
+Each application's skills, work experience and extracted CV text are cut
+into word shingles and summarised as a MinHash signature, whose positions
+agree between two applications with probability equal to the Jaccard
+similarity of their shingle sets. The signature is split into LSH bands;
+every band is hashed to a MinHashBucket row. Two applications become
+candidates only when they share a bucket, which is an index lookup rather
+than a comparison with every other applicant, and candidates are kept when
+their signatures agree on at least DUPLICATE_THRESHOLD of the positions.
+"""
+import hashlib
+import re
+import zlib
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .cv_text import index_cv
+from .models import CVDocument, JobApplication, MinHashBucket
+from .tasks import enqueue
+
+SHINGLE_SIZE = 3
+# Below this many shingles (e.g. skills "Python" and no CV text) unrelated
+# applicants would get identical signatures, so none is stored.
+MIN_SHINGLES = 5
+BANDS = 16
+ROWS = 8
+NUM_PERM = BANDS * ROWS
+# With 16 bands of 8 rows, pairs at this similarity share a bucket about
+# 95% of the time, and pairs below 0.5 almost never do.
+DUPLICATE_THRESHOLD = 0.8
+# Clusters tracked per bucket. Boilerplate shared by very many unrelated
+# applicants fills whole buckets; past this many clusters, later members are
+# still compared with the ones tracked but do not start new ones.
+MAX_BUCKET_CLUSTERS = 200
+# Fields whose changes call for a new signature.
+TEXT_FIELDS = {"skills", "work_experience", "cv_file"}
+
+WORD = re.compile(r"\w+")
+MERSENNE_PRIME = (1 << 31) - 1
+# Hash functions h(x) = (a * x + b) mod p. With x below 2**32 and a below
+# 2**31 the product fits in 64 bits.
+_rng = np.random.default_rng(20240611)
+_A = _rng.integers(1, MERSENNE_PRIME, NUM_PERM, dtype=np.uint64)[:, None]
+_B = _rng.integers(0, MERSENNE_PRIME, NUM_PERM, dtype=np.uint64)[:, None]
+
+
+def shingles(*texts):
+    """
+    Returns the set of SHINGLE_SIZE-word shingles in each text. Texts
+    shorter than that count as one shingle.
+    """
+    result = set()
+    for text in texts:
+        words = WORD.findall((text or "").lower())
+        if len(words) <= SHINGLE_SIZE:
+            if words:
+                result.add(" ".join(words))
+            continue
+        result.update(
+            " ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)
+        )
+    return result
+
+
+def signature(shingle_set):
+    """
+    Returns the MinHash signature of `shingle_set` as NUM_PERM uint32
+    values, or None when the set is too small to tell applicants apart.
+    """
+    if len(shingle_set) < MIN_SHINGLES:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode()) for shingle in shingle_set),
+        dtype=np.uint64,
+        count=len(shingle_set),
+    )
+    return ((_A * hashes + _B) % MERSENNE_PRIME).min(axis=1).astype("<u4")
+
+
+def load_signature(value):
+    return None if value is None else np.frombuffer(bytes(value), dtype="<u4")
+
+
+def band_keys(sig):
+    """
+    Returns one signed 64-bit bucket key per band of `sig`.
+    """
+    return [
+        int.from_bytes(
+            hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "little", signed=True
+        )
+        for band in sig.reshape(BANDS, ROWS)
+    ]
+
+
+def similarity(a, b):
+    """
+    Estimated Jaccard similarity of the texts behind two signatures.
+    """
+    return float(np.mean(a == b))
+
+
+def index_applications(applications):
+    """
+    Stores the signature and LSH buckets of each application, replacing any
+    earlier ones. CV text is used when it has been extracted.
+    """
+    applications = list(applications)
+    cv_texts = dict(
+        CVDocument.objects.filter(
+            file_name__in={application.cv_file.name for application in applications}
+        ).values_list("file_name", "text")
+    )
+    buckets = []
+    for application in applications:
+        sig = signature(shingles(
+            application.skills,
+            application.work_experience,
+            cv_texts.get(application.cv_file.name, ""),
+        ))
+        application.minhash = None if sig is None else sig.tobytes()
+        if sig is not None:
+            buckets.extend(
+                MinHashBucket(application=application, job_id=application.job_id, band=band, key=key)
+                for band, key in enumerate(band_keys(sig))
+            )
+    with transaction.atomic():
+        JobApplication.objects.bulk_update(applications, ["minhash"])
+        MinHashBucket.objects.filter(application__in=applications).delete()
+        MinHashBucket.objects.bulk_create(buckets)
+
+
+def index_application(application_id):
+    """
+    Extracts the application's CV if needed, then indexes it.
+    """
+    application = JobApplication.objects.filter(pk=application_id).first()
+    if application is None:
+        return
+    index_cv(application.cv_file.name)
+    index_applications([application])
+
+
+def queue_duplicate_indexing(application_id):
+    enqueue(index_application, application_id)
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def flag_duplicates(job, applications):
+    """
+    Sets `duplicate_group` on each of `applications` (all for `job`): a
+    1-based cluster number shared by near-duplicates, or None. Returns the
+    clusters as lists of applications.
+    """
+    by_id = {application.pk: application for application in applications}
+    for application in applications:
+        application.duplicate_group = None
+    # Only bucket rows that collide with another application's are read.
+    colliding = MinHashBucket.objects.filter(job=job).filter(
+        Exists(
+            MinHashBucket.objects.filter(
+                job=job, band=OuterRef("band"), key=OuterRef("key")
+            ).exclude(application=OuterRef("application"))
+        )
+    )
+    shared = {}
+    for band, key, application_id in colliding.order_by("application_id").values_list(
+        "band", "key", "application_id"
+    ):
+        if application_id in by_id:
+            shared.setdefault((band, key), []).append(application_id)
+
+    signatures = {pk: load_signature(by_id[pk].minhash) for pk in by_id}
+    parent = {pk: pk for pk in by_id}
+    # Each member is compared with one representative of every cluster
+    # already seen in its bucket, so a bucket of k applications in c
+    # clusters costs at most k * c comparisons, not k * (k - 1) / 2.
+    for members in shared.values():
+        representatives = []
+        for member in members:
+            if signatures[member] is None:
+                continue
+            joined = False
+            for representative in representatives:
+                if _find(parent, member) == _find(parent, representative):
+                    joined = True
+                elif similarity(signatures[member], signatures[representative]) >= (
+                    DUPLICATE_THRESHOLD
+                ):
+                    parent[_find(parent, member)] = _find(parent, representative)
+                    joined = True
+            if not joined and len(representatives) < MAX_BUCKET_CLUSTERS:
+                representatives.append(member)
+
+    clusters = {}
+    for application in applications:
+        clusters.setdefault(_find(parent, application.pk), []).append(application)
+    clusters = [members for members in clusters.values() if len(members) > 1]
+    for number, members in enumerate(clusters, 1):
+        for application in members:
+            application.duplicate_group = number
+    return clusters
@@ -0,0 +1,123 @@
+import csv
+import json
+
+from .models import JobApplication
+
+EXPORT_FIELDS = (
+    "id",
+    "full_name",
+    "email",
+    "phone_number",
+    "skills",
+    "work_experience",
+    "education",
+    "cv_file",
+    "status",
+    "feedback",
+    "is_active",
+    "submitted_at",
+)
+EXPORT_CHUNK_SIZE = 2000
+# Spreadsheets evaluate a cell that starts with one of these as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Echo:
+    """
+    File-like object whose write() hands the line straight back, so csv.writer
+    can format rows without buffering them.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _applications(job):
+    return JobApplication.objects.filter(job=job).order_by("id")
+
+
+def application_rows(job):
+    """
+    Yields the exported fields of every application for `job`, streamed from
+    a server-side cursor so memory stays flat however many rows there are.
+    """
+    return (
+        _applications(job)
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+async def aapplication_rows(job):
+    """
+    Async counterpart of application_rows.
+    """
+    # values_list() runs its query as soon as it is iterated, which aiterator()
+    # does on the event loop; values() defers it to the fetch thread.
+    rows = _applications(job).values(*EXPORT_FIELDS)
+    async for row in rows.aiterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield tuple(row[field] for field in EXPORT_FIELDS)
+
+
+async def _batches(rows):
+    # One response chunk per fetched chunk of rows, rather than one per row.
+    batch = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) == EXPORT_CHUNK_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _text(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _cell(value):
+    """
+    Returns `value` as CSV text. Applicant-supplied text that a spreadsheet
+    would run as a formula is prefixed with a quote so it shows as typed.
+    """
+    value = _text(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _jsonl_line(row):
+    return json.dumps(dict(zip(EXPORT_FIELDS, map(_text, row)))) + "\n"
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([_cell(value) for value in row])
+
+
+async def aiter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    async for batch in _batches(rows):
+        yield "".join(writer.writerow([_cell(value) for value in row]) for row in batch)
+
+
+def iter_jsonl(rows):
+    for row in rows:
+        yield _jsonl_line(row)
+
+
+async def aiter_jsonl(rows):
+    async for batch in _batches(rows):
+        yield "".join(map(_jsonl_line, batch))
+
+
+# Format: (serializer, async serializer, content type).
+FORMATS = {
+    "csv": (iter_csv, aiter_csv, "text/csv"),
+    "jsonl": (iter_jsonl, aiter_jsonl, "application/x-ndjson"),
+}
@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.models import User
 from .models import JobApplication, JobPosition, Profile
+from .uploads import claim_session
 
 class UserRegistrationForm(forms.ModelForm):
     password = forms.CharField(widget=forms.PasswordInput)
@@ -38,6 +39,14 @@ class JobForm(forms.ModelForm):
         }
 
 class JobApplicationForm(forms.ModelForm):
+    # Id of a finished resumable upload, used instead of posting cv_file.
+    cv_upload = forms.CharField(required=False, widget=forms.HiddenInput)
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user = user
+        self.fields["cv_file"].required = False
+
     class Meta:
         model = JobApplication
         fields = [
@@ -57,12 +66,53 @@ class JobApplicationForm(forms.ModelForm):
             raise forms.ValidationError("Only PDF, DOC, and DOCX files are allowed.")
         return cv_file
 
+    def clean_cv_upload(self):
+        upload_id = self.cleaned_data.get("cv_upload")
+        if not upload_id:
+            return None
+        session = claim_session(self.user, upload_id)
+        if session is None:
+            raise forms.ValidationError("The uploaded CV could not be found. Please upload it again.")
+        return session
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get("cv_file") and not cleaned_data.get("cv_upload"):
+            if "cv_file" not in self.errors and "cv_upload" not in self.errors:
+                self.add_error("cv_file", "This field is required.")
+        return cleaned_data
+
 class ApplicationStatusForm(forms.ModelForm):
     class Meta:
         model = JobApplication
         fields = ("status",)
 
 
+class BulkApplicationUpdateForm(forms.Form):
+    applications = forms.ModelMultipleChoiceField(
+        queryset=JobApplication.objects.none(),
+        widget=forms.CheckboxSelectMultiple,
+    )
+    status = forms.ChoiceField(
+        choices=(("", "Keep current status"),) + JobApplication.STATUS_CHOICES,
+        required=False,
+    )
+    feedback = forms.CharField(widget=forms.Textarea(attrs={"rows": 3}), required=False)
+
+    def __init__(self, *args, job=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only applications to this job can be selected.
+        self.fields["applications"].queryset = JobApplication.objects.filter(job=job).only(
+            "id", "applicant_id", "status", "feedback"
+        )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get("status") and not cleaned_data.get("feedback"):
+            raise forms.ValidationError("Choose a status or enter feedback to apply.")
+        return cleaned_data
+
+
 class ProfileImageForm(forms.ModelForm):
     class Meta:
         model = Profile
@@ -0,0 +1,144 @@
+import datetime
+import io
+import os
+import re
+import uuid
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .tasks import enqueue
+
+RENDITION_SIZES = (300, 150, 64)
+RENDITION_FORMATS = (("WEBP", "webp"), ("PNG", "png"))
+# Profile.profile_picture points at this rendition once processing is done.
+PRIMARY_RENDITION = (300, "png")
+
+RENDITION_NAME = re.compile(r"^(?P<base>.+)-(?P<size>\d+)\.(?P<ext>webp|png)$")
+UPLOAD_DIR = "profiles/uploads"
+# A task still unfinished after this long was lost (e.g. a worker restart).
+PROCESSING_TIMEOUT = datetime.timedelta(minutes=10)
+PROCESSING_FAILED = "The image could not be processed. Please try another file."
+
+
+def rendition_name(name, size, ext):
+    """
+    Returns the storage name of another rendition of the same picture, or
+    None when `name` is not a processed rendition (e.g. the default image).
+    """
+    match = RENDITION_NAME.match(name or "")
+    if not match:
+        return None
+    return f"{match['base']}-{size}.{ext}"
+
+
+def delete_renditions(name):
+    for size in RENDITION_SIZES:
+        for _, ext in RENDITION_FORMATS:
+            other = rendition_name(name, size, ext)
+            if other and default_storage.exists(other):
+                default_storage.delete(other)
+
+
+def is_processing(profile):
+    return bool(profile.picture_task) and (
+        profile.picture_task_at > timezone.now() - PROCESSING_TIMEOUT
+    )
+
+
+def processing_error(profile):
+    """
+    Returns why the latest upload did not become the profile picture, or
+    an empty string.
+    """
+    if profile.picture_task and not is_processing(profile):
+        return PROCESSING_FAILED
+    return profile.picture_error
+
+
+def queue_profile_picture(profile, upload):
+    """
+    Stores the raw upload and hands cropping and resizing to the background
+    pool. Returns immediately; the profile switches once renditions exist.
+    """
+    token = uuid.uuid4().hex
+    ext = os.path.splitext(upload.name)[1].lower()
+    original_name = default_storage.save(f"{UPLOAD_DIR}/{token}{ext}", upload)
+    profile.picture_task, profile.picture_task_at, profile.picture_error = (
+        token, timezone.now(), ""
+    )
+    profile.save(update_fields=["picture_task", "picture_task_at", "picture_error"])
+    enqueue(process_profile_picture, profile.pk, original_name, token)
+    return token
+
+
+def _square(image):
+    width, height = image.size
+    if width == height:
+        return image
+    min_dim = min(width, height)
+    left = (width - min_dim) // 2
+    top = (height - min_dim) // 2
+    return image.crop((left, top, left + min_dim, top + min_dim))
+
+
+def build_renditions(original_name, base):
+    """
+    Writes every size/format rendition of the original under `base` and
+    returns their storage names.
+    """
+    largest = RENDITION_SIZES[0]
+    with default_storage.open(original_name) as source:
+        image = Image.open(source)
+        # Lets the JPEG decoder skip detail we are about to throw away.
+        image.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        image = _square(image).resize((largest, largest), Image.LANCZOS)
+
+    names = []
+    for size in RENDITION_SIZES:
+        # Each smaller size is resampled from the previous one, not the original.
+        if image.width != size:
+            image = image.resize((size, size), Image.LANCZOS)
+        for fmt, ext in RENDITION_FORMATS:
+            buffer = io.BytesIO()
+            image.save(buffer, format=fmt, **({"quality": 85} if fmt == "WEBP" else {}))
+            names.append(
+                default_storage.save(f"{base}-{size}.{ext}", ContentFile(buffer.getvalue()))
+            )
+    return names
+
+
+def process_profile_picture(profile_id, original_name, token):
+    from .models import Profile
+
+    # Only the latest upload may change the profile.
+    latest = Profile.objects.filter(pk=profile_id, picture_task=token)
+    base = f"profiles/{profile_id}/{token}"
+    try:
+        try:
+            names = build_renditions(original_name, base)
+        finally:
+            default_storage.delete(original_name)
+    except Exception:
+        latest.update(picture_task="", picture_error=PROCESSING_FAILED)
+        raise
+
+    with transaction.atomic():
+        row = latest.select_for_update().values_list("profile_picture").first()
+        # A newer upload was queued while this one was processing.
+        if row is None:
+            for name in names:
+                default_storage.delete(name)
+            return
+        latest.update(
+            profile_picture=f"{base}-{PRIMARY_RENDITION[0]}.{PRIMARY_RENDITION[1]}",
+            picture_task="",
+        )
+    if row[0]:
+        delete_renditions(row[0])
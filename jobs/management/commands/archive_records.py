@@ -0,0 +1,34 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.archive import BATCH_SIZE, archive_records
+
+
+class Command(BaseCommand):
+    help = 'Moves old closed jobs and withdrawn applications to the archive tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.ARCHIVE_AFTER_DAYS,
+            help='Age after which closed jobs and withdrawn applications are archived.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Rows moved per transaction.',
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='Seconds to wait between batches, to leave room for other writers.',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(days=options['days'])
+        jobs, applications = archive_records(
+            cutoff, batch_size=options['batch_size'], pause=options['pause']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {jobs} jobs and {applications} applications.'
+        ))
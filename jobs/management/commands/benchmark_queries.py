@@ -0,0 +1,117 @@
+import datetime
+import re
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from jobs.models import JobApplication, JobPosition, Notification
+from jobs.pagination import seek
+from jobs.synthetic import Plan, generate
+
+BATCH_SIZE = 5000
+
+# Plan lines that mean a whole table is read. SQLite reports "SCAN <table>"
+# (optionally with an index used only for ordering); PostgreSQL reports
+# "Seq Scan on <table>".
+FULL_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN (?!.*USING (?:COVERING )?INDEX)(\w+)"),
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+}
+
+
+def full_scans(plan, vendor):
+    pattern = FULL_SCAN_PATTERNS.get(vendor)
+    return pattern.findall(plan) if pattern else []
+
+
+class Command(BaseCommand):
+    help = 'Prints EXPLAIN plans and timings for the hot query shapes and flags full table scans.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--populate', type=int, default=0, metavar='ROWS',
+            help='First insert ROWS synthetic applications (with matching users, jobs and notifications).',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Executions per query when measuring timings.',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Random seed for synthetic data.',
+        )
+
+    def handle(self, *args, **options):
+        if options['populate']:
+            self._populate(options['populate'], options['seed'])
+        # Planner statistics, as a production database would have.
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        poster = JobPosition.objects.values_list('posted_by_id', flat=True).order_by('?').first()
+        sample = JobApplication.objects.values_list('job_id', 'applicant_id').order_by('-id').first()
+        open_jobs = JobPosition.objects.filter(status='Open').order_by('-created_at', '-id')
+        # Seek from the middle of the listing, as a deep page would.
+        middle = open_jobs[open_jobs.count() // 2:][:1].first()
+        if poster is None or sample is None or middle is None:
+            self.stderr.write('No data to benchmark; run with --populate first.')
+            return
+        job_id, applicant_id = sample
+        seven_days_ago = timezone.now() - datetime.timedelta(days=7)
+
+        queries = {
+            'job list (first page)': lambda: JobPosition.objects.filter(status='Open').order_by('-created_at', '-id')[:21],
+            'job list (deep keyset page)': lambda: seek(open_jobs, middle.created_at, middle.id)[:21],
+            'employer dashboard': lambda: JobPosition.objects.filter(posted_by_id=poster).annotate(
+                application_count=Count('jobapplication'),
+                new_application_count=Count('jobapplication', filter=Q(jobapplication__submitted_at__gte=seven_days_ago)),
+            ).order_by('-created_at'),
+            'applicants for job': lambda: JobApplication.objects.filter(job_id=job_id).order_by('-submitted_at'),
+            'applicant dashboard': lambda: JobApplication.objects.filter(
+                applicant_id=applicant_id, is_active=True
+            ).order_by('-submitted_at'),
+            'unread notifications': lambda: Notification.objects.filter(recipient_id=applicant_id, is_read=False),
+            'duplicate application guard': lambda: JobApplication.objects.filter(job_id=job_id, applicant_id=applicant_id),
+        }
+
+        self.stdout.write(
+            f'{JobPosition.objects.count()} jobs, {JobApplication.objects.count()} applications, '
+            f'{Notification.objects.count()} notifications on {connection.vendor}.'
+        )
+        failures = []
+        for label, build in queries.items():
+            queryset = build()
+            plan = queryset.explain()
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                list(build())
+                timings.append((time.perf_counter() - start) * 1000)
+            scans = full_scans(plan, connection.vendor)
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{label}'))
+            self.stdout.write(plan)
+            self.stdout.write(
+                f'median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms'
+            )
+            if scans:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(f'full scan of {", ".join(scans)}'))
+            elif 'TEMP B-TREE' in plan or 'Sort' in plan:
+                self.stdout.write(self.style.WARNING('sorts outside an index'))
+
+        if failures:
+            self.stdout.write(self.style.ERROR(f'\nFull scans in: {", ".join(failures)}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('\nNo hot path does a full table scan.'))
+
+    def _populate(self, rows, seed):
+        plan = Plan(
+            users=max(rows // 20, 2), jobs=max(rows // 50, 1),
+            applications=rows, notifications=rows, seed=seed, batch_size=BATCH_SIZE,
+        )
+        self.stdout.write(f'Inserting {plan.users} users, {plan.jobs} jobs and {plan.applications} applications...')
+        generate(plan)
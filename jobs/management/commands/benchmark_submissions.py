@@ -0,0 +1,131 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import JobApplication, JobPosition, Profile
+
+CV_CONTENT = b'Benchmark applicant CV with enough plain text to index.'
+# Seconds one half of a double submission waits for the other.
+BARRIER_TIMEOUT = 60
+
+
+class Command(BaseCommand):
+    help = 'Submits job applications from concurrent clients and reports throughput, latency and errors.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applicants', type=int, default=100, help='Applicants submitting.')
+        parser.add_argument('--concurrency', type=int, default=8, help='Simultaneous clients.')
+        parser.add_argument(
+            '--double-submit', action='store_true',
+            help='Have every applicant submit twice at the same time, from two threads.',
+        )
+        parser.add_argument(
+            '--keep', action='store_true',
+            help='Keep the benchmark users, job and applications afterwards.',
+        )
+
+    def handle(self, *args, **options):
+        run = f'{int(time.time())}'
+        poster = User.objects.create_user(f'submit-poster-{run}')
+        Profile.objects.create(user=poster, role='POSTER')
+        job = JobPosition.objects.create(
+            title='Submission benchmark', description='Benchmark job', required_skills='Python',
+            location='Remote', job_type='Full-time',
+            application_deadline=timezone.now().date() + timezone.timedelta(days=30),
+            posted_by=poster,
+        )
+        User.objects.bulk_create(
+            User(username=f'submit-{run}-{i}', password='!') for i in range(options['applicants'])
+        )
+        applicants = list(User.objects.filter(username__startswith=f'submit-{run}-'))
+        Profile.objects.bulk_create(Profile(user=user, role='APPLICANT') for user in applicants)
+        if options['double_submit']:
+            # Two threads work through the same applicants and meet at a
+            # barrier before each post, so both submissions of an applicant
+            # are in flight together rather than one after the other.
+            pairs = max(options['concurrency'] // 2, 1)
+            batches = []
+            for i in range(pairs):
+                barrier = threading.Barrier(2)
+                batch = [(user, barrier) for user in applicants[i::pairs]]
+                batches += [batch, batch]
+        else:
+            batches = [
+                [(user, None) for user in applicants[i::options['concurrency']]]
+                for i in range(options['concurrency'])
+            ]
+        submissions = sum(map(len, batches))
+
+        self.stdout.write(
+            f'{submissions} submissions from {len(batches)} clients '
+            f'on {connection.vendor}...'
+        )
+        url = reverse('apply_for_job', args=[job.id])
+        local = threading.local()
+        lock = threading.Lock()
+        latencies, failures = [], []
+
+        def submit(user, barrier):
+            # One client per thread; each logs in as the applicant it submits for.
+            if not hasattr(local, 'client'):
+                local.client = Client(HTTP_HOST='localhost')
+            local.client.force_login(user)
+            start = time.perf_counter()
+            try:
+                if barrier is not None:
+                    barrier.wait(BARRIER_TIMEOUT)
+                    start = time.perf_counter()
+                response = local.client.post(url, {
+                    'full_name': user.username, 'email': 'bench@example.com', 'phone_number': '555',
+                    'skills': 'Python', 'work_experience': '1 year', 'education': 'B.Sc.',
+                    'cv_file': SimpleUploadedFile('cv.doc', CV_CONTENT, 'application/msword'),
+                })
+                error = None if response.status_code == 302 else f'HTTP {response.status_code}'
+            except Exception as exc:
+                error = f'{type(exc).__name__}: {exc}'
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if error:
+                    failures.append(error)
+
+        def worker(batch):
+            try:
+                for user, barrier in batch:
+                    submit(user, barrier)
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(len(batches)) as pool:
+            list(pool.map(worker, batches))
+        wall = time.perf_counter() - started
+
+        stored = JobApplication.objects.filter(job=job).count()
+        latencies.sort()
+        self.stdout.write(
+            f'{submissions / wall:.1f} submissions/s, '
+            f'p50 {statistics.median(latencies) * 1000:.1f} ms, '
+            f'p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms'
+        )
+        for error in sorted(set(failures)):
+            self.stdout.write(self.style.WARNING(f'{failures.count(error)} x {error}'))
+        if stored == len(applicants):
+            self.stdout.write(self.style.SUCCESS(f'{stored} applications stored, one per applicant.'))
+        else:
+            self.stdout.write(self.style.ERROR(
+                f'{stored} applications stored for {len(applicants)} applicants.'
+            ))
+
+        if not options['keep']:
+            job.delete()
+            User.objects.filter(pk__in=[poster.pk, *(user.pk for user in applicants)]).delete()
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from jobs.deadlines import BATCH_SIZE, close_expired_jobs
+
+
+class Command(BaseCommand):
+    help = 'Closes open job postings whose application deadline has passed. Run it daily.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Jobs closed per UPDATE.',
+        )
+
+    def handle(self, *args, **options):
+        closed = close_expired_jobs(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Closed {closed} expired job postings.'))
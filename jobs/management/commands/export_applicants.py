@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.exports import FORMATS, application_rows
+from jobs.models import JobPosition
+
+
+class Command(BaseCommand):
+    help = 'Streams the applications for a job to stdout or a file as CSV or JSON Lines.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_id', type=int)
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument('--output', help='File to write to instead of stdout.')
+
+    def handle(self, *args, **options):
+        try:
+            job = JobPosition.objects.get(pk=options['job_id'])
+        except JobPosition.DoesNotExist:
+            raise CommandError(f'Job {options["job_id"]} does not exist.')
+
+        serialize, _, _ = FORMATS[options['format']]
+        lines = serialize(application_rows(job))
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,49 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.cv_text import extract_result, pending_cv_names
+from jobs.models import CVDocument
+
+
+def _init_worker():
+    # Needed when workers are spawned rather than forked.
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = 'Extracts the text of every CV that has not been indexed yet, in parallel.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Number of extraction processes.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of extracted CVs written per query.',
+        )
+
+    def handle(self, *args, **options):
+        names = pending_cv_names()
+        self.stdout.write(f'Extracting {len(names)} CVs with {options["workers"]} workers...')
+        # Workers only read files; make sure they do not inherit open connections.
+        connections.close_all()
+
+        batch = []
+        failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+            for name, text, error in pool.map(extract_result, names, chunksize=16):
+                failed += bool(error)
+                batch.append(CVDocument(file_name=name, text=text, error=error))
+                if len(batch) >= options['batch_size']:
+                    CVDocument.objects.bulk_create(batch, ignore_conflicts=True)
+                    batch = []
+        CVDocument.objects.bulk_create(batch, ignore_conflicts=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Extracted {len(names) - failed} CVs ({failed} could not be read).'
+        ))
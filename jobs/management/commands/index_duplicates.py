@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from jobs.duplicates import index_applications
+from jobs.models import JobApplication
+
+
+class Command(BaseCommand):
+    help = 'Computes the MinHash signatures and LSH buckets used to flag near-duplicate applications.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Re-index every application, e.g. after extract_cv_text has added CV text.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Applications indexed per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        applications = JobApplication.objects.order_by('pk').only(
+            'job_id', 'skills', 'work_experience', 'cv_file'
+        )
+        if not options['all']:
+            applications = applications.filter(minhash__isnull=True)
+        count, last_pk = 0, 0
+        while True:
+            batch = list(applications.filter(pk__gt=last_pk)[:options['batch_size']])
+            if not batch:
+                break
+            index_applications(batch)
+            count += len(batch)
+            last_pk = batch[-1].pk
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} applications.'))
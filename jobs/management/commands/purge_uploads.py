@@ -0,0 +1,26 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.models import UploadSession
+from jobs.uploads import discard_session
+
+
+class Command(BaseCommand):
+    help = 'Deletes resumable upload sessions that were abandoned or never used.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours', type=int, default=24,
+            help='Age after which an upload session is considered abandoned.',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(hours=options['hours'])
+        sessions = UploadSession.objects.filter(created_at__lt=cutoff).select_related('stored_file')
+        count = 0
+        for session in sessions.iterator():
+            discard_session(session)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Purged {count} upload sessions.'))
@@ -1,12 +1,75 @@
 import datetime
-from django.core.management.base import BaseCommand
+import time
+
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
+from django.utils import timezone
 from jobs.models import Profile, JobPosition, CompanyInfo
+from jobs.synthetic import Plan, generate
+
+# Rows per unit of --scale.
+SCALE_UNIT = {'users': 1000, 'jobs': 200, 'applications': 5000, 'notifications': 5000}
 
 class Command(BaseCommand):
     help = 'Seeds the database with initial data.'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int, default=0,
+            help='Also add synthetic data: per unit 1000 users, 200 jobs, 5000 applications and '
+                 '5000 notifications. --scale 1000 gives a million users.',
+        )
+        for table in SCALE_UNIT:
+            parser.add_argument(f'--{table}', type=int, help=f'Override the number of synthetic {table}.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for synthetic data.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per insert transaction. Part of what determines the generated rows, with --seed.')
+        parser.add_argument(
+            '--now', type=datetime.datetime.fromisoformat,
+            help='Reference time for synthetic timestamps, e.g. 2026-01-01T00:00:00. Defaults to '
+                 'the current time; fix it to generate the same rows on every run.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Processes inserting synthetic chunks in parallel. The output does not depend on this.',
+        )
+        parser.add_argument(
+            '--keep', action='store_true',
+            help='Add synthetic data without deleting existing data first.',
+        )
+
     def handle(self, *args, **options):
+        if not options['keep']:
+            self.seed_demo()
+        if options['scale'] or any(options[table] for table in SCALE_UNIT):
+            self.seed_synthetic(options)
+
+    def seed_synthetic(self, options):
+        counts = {
+            table: options[table] if options[table] is not None else unit * options['scale']
+            for table, unit in SCALE_UNIT.items()
+        }
+        if counts['users'] < 2 or counts['jobs'] < 1:
+            raise CommandError('Synthetic data needs at least 2 users and 1 job.')
+        now = options['now']
+        if now is not None and timezone.is_naive(now):
+            now = timezone.make_aware(now)
+        plan = Plan(seed=options['seed'], batch_size=options['batch_size'], now=now, **counts)
+        self.stdout.write(
+            f'Generating {plan.users} users, {plan.jobs} jobs, {plan.applications} applications '
+            f'and {plan.notifications} notifications...'
+        )
+        started = time.perf_counter()
+        generate(
+            plan,
+            workers=options['workers'],
+            progress=lambda table, rows: self.stdout.write(f'  {rows} {table}'),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated synthetic data in {time.perf_counter() - started:.1f}s. '
+            f'Synthetic users log in with password "password123".'
+        ))
+
+    def seed_demo(self):
         self.stdout.write('Seeding database...')
 
         # Clean up existing data
@@ -0,0 +1,95 @@
+import re
+
+import numpy as np
+
+SKILL_SEPARATORS = re.compile(r"[,;/|\n]+")
+
+
+def tokenize_skills(text):
+    """
+    Returns the normalised skill names listed in a free-text skills field.
+    """
+    if not text:
+        return []
+    return [
+        " ".join(part.lower().split())
+        for part in SKILL_SEPARATORS.split(text)
+        if part.strip()
+    ]
+
+
+class SkillVocabulary:
+    """
+    Maps each skill required by a job to a column index.
+    """
+
+    def __init__(self, skills):
+        self.index = {skill: i for i, skill in enumerate(dict.fromkeys(skills))}
+
+    def __len__(self):
+        return len(self.index)
+
+    def encode(self, candidates):
+        """
+        Returns the (row, column) coordinates of a sparse candidate x skill
+        matrix. Each candidate is a sequence of free-text skills fields.
+        """
+        # Identical skills text (e.g. a profile reused across many
+        # applications) is tokenized only once.
+        text_columns = {}
+        rows, columns = [], []
+        for row, texts in enumerate(candidates):
+            for text in texts:
+                if text not in text_columns:
+                    text_columns[text] = [
+                        self.index[skill]
+                        for skill in tokenize_skills(text)
+                        if skill in self.index
+                    ]
+                rows.extend([row] * len(text_columns[text]))
+                columns.extend(text_columns[text])
+        return np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64)
+
+
+def score_skills(required_skills, candidates):
+    """
+    Returns the share of `required_skills` each candidate covers, in [0, 1].
+    """
+    vocabulary = SkillVocabulary(tokenize_skills(required_skills))
+    size = len(vocabulary)
+    if not size:
+        return np.zeros(len(candidates))
+    rows, cols = vocabulary.encode(candidates)
+    # A dense candidate x skill grid (one byte per cell; jobs list a handful
+    # of skills) counts a skill listed in both the application and the
+    # profile once, without sorting the cells to deduplicate them.
+    matched = np.zeros((len(candidates), size), dtype=bool)
+    matched[rows, cols] = True
+    return matched.sum(axis=1) / size
+
+
+def annotate_match_scores(job, applications):
+    """
+    Sets `match_score` on every application and returns the scores array.
+    Expects applications fetched with select_related("applicant__profile").
+    """
+    candidates = [
+        (
+            application.skills,
+            getattr(getattr(application.applicant, "profile", None), "skills", ""),
+        )
+        for application in applications
+    ]
+    scores = score_skills(job.required_skills, candidates)
+    for application, score in zip(applications, scores.tolist()):
+        application.match_score = score
+    return scores
+
+
+def sort_by_match(applications, scores):
+    """
+    Returns the applications ordered by descending score, keeping the
+    existing order between equal scores.
+    """
+    order = np.argsort(-scores, kind="stable")
+    return [applications[i] for i in order]
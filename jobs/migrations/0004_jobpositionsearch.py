@@ -0,0 +1,117 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+FTS_TABLE = "jobs_jobposition_fts"
+
+SQLITE_FORWARD = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, description, required_skills,
+        content='jobs_jobposition', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    # Weight title over skills over description when ranking with bm25().
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25(10.0, 2.0, 5.0)')",
+    f"""
+    CREATE TRIGGER jobs_jobposition_fts_ai AFTER INSERT ON jobs_jobposition BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, required_skills)
+        VALUES (new.id, new.title, new.description, new.required_skills);
+    END
+    """,
+    f"""
+    CREATE TRIGGER jobs_jobposition_fts_ad AFTER DELETE ON jobs_jobposition BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, required_skills)
+        VALUES ('delete', old.id, old.title, old.description, old.required_skills);
+    END
+    """,
+    f"""
+    CREATE TRIGGER jobs_jobposition_fts_au AFTER UPDATE OF title, description, required_skills
+    ON jobs_jobposition BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, required_skills)
+        VALUES ('delete', old.id, old.title, old.description, old.required_skills);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, required_skills)
+        VALUES (new.id, new.title, new.description, new.required_skills);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS jobs_jobposition_fts_au",
+    "DROP TRIGGER IF EXISTS jobs_jobposition_fts_ad",
+    "DROP TRIGGER IF EXISTS jobs_jobposition_fts_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_INDEX = "jobs_jobposition_search_gin"
+
+
+def _add_postgres_index(apps, schema_editor):
+    # Built from the same SearchVector the search code filters on, so the
+    # planner can match the expression to the index.
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    JobPosition = apps.get_model("jobs", "JobPosition")
+    index = GinIndex(
+        SearchVector("title", "description", "required_skills", config="english"),
+        name=POSTGRES_INDEX,
+    )
+    schema_editor.add_index(JobPosition, index)
+
+
+def _remove_postgres_index(apps, schema_editor):
+    schema_editor.execute(f"DROP INDEX IF EXISTS {POSTGRES_INDEX}")
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in SQLITE_FORWARD:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        _add_postgres_index(apps, schema_editor)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in SQLITE_REVERSE:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        _remove_postgres_index(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0003_profile_education_profile_skills_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobPositionSearch",
+            fields=[
+                (
+                    "job",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_entry",
+                        serialize=False,
+                        to="jobs.jobposition",
+                    ),
+                ),
+                ("document", models.TextField(db_column="jobs_jobposition_fts")),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "jobs_jobposition_fts",
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:18
+
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db import migrations, models
+
+
+def check_duplicate_applications(apps, schema_editor):
+    # Double submits could slip past the old check-then-insert guard. Which
+    # copy to keep is for whoever owns the data to decide, so refuse to add
+    # the constraint until the duplicates have been resolved by hand.
+    JobApplication = apps.get_model("jobs", "JobApplication")
+    duplicates = (
+        JobApplication.objects.values("job_id", "applicant_id")
+        .annotate(count=models.Count("id"))
+        .filter(count__gt=1)
+        .order_by("job_id", "applicant_id")
+    )
+    conflicts = []
+    for row in duplicates:
+        ids = (
+            JobApplication.objects.filter(job_id=row["job_id"], applicant_id=row["applicant_id"])
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        conflicts.append(
+            f"job {row['job_id']}, applicant {row['applicant_id']}: "
+            f"applications {', '.join(map(str, ids))}"
+        )
+    if conflicts:
+        raise CommandError(
+            "Cannot add jobs_unique_application_per_job: these applicants applied "
+            "to the same job more than once. Delete or merge the extra applications, "
+            "then run migrate again.\n  " + "\n  ".join(conflicts)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_cvdocument'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', '-submitted_at'], name='jobs_app_job_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['applicant', '-submitted_at'], name='jobs_app_applicant_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposition',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='jobs_job_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposition',
+            index=models.Index(fields=['posted_by', '-created_at'], name='jobs_job_poster_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['recipient', '-created_at'], name='jobs_notif_unread_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobapplication',
+            constraint=models.UniqueConstraint(fields=('job', 'applicant'), name='jobs_unique_application_per_job'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_admin_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJobApplication',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('payload', models.BinaryField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('job_id', models.BigIntegerField()),
+                ('job_title', models.CharField(max_length=200)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Interview', 'Interview'), ('Accepted', 'Accepted'), ('Rejected', 'Rejected')], max_length=20)),
+                ('is_active', models.BooleanField()),
+                ('submitted_at', models.DateTimeField()),
+                ('applicant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['applicant', '-submitted_at'], name='jobs_arcapp_applicant_idx'), models.Index(fields=['job_id', '-submitted_at'], name='jobs_arcapp_job_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedJobPosition',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('payload', models.BinaryField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('title', models.CharField(max_length=200)),
+                ('created_at', models.DateTimeField()),
+                ('application_count', models.PositiveIntegerField(default=0)),
+                ('posted_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['posted_by', '-created_at'], name='jobs_arcjob_poster_idx')],
+            },
+        ),
+    ]
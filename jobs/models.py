@@ -1,3 +1,8 @@
+import json
+import uuid
+import zlib
+from functools import cached_property
+
 from django.contrib.auth.models import User
 from django.db import models
 
@@ -32,6 +37,11 @@ class Profile(models.Model):
         upload_to="profiles/", default="profiles/default.jpg", null=True, blank=True
     )
     cv = models.FileField(upload_to="cvs/", null=True, blank=True)
+    # Background picture processing (see jobs.images). Kept in the database
+    # so every worker answers status polls the same way.
+    picture_task = models.CharField(max_length=32, blank=True, editable=False)
+    picture_task_at = models.DateTimeField(null=True, blank=True, editable=False)
+    picture_error = models.CharField(max_length=255, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.user.username} - {self.get_role_display()}"
@@ -57,6 +67,22 @@ class JobPosition(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="Open")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Open-job listings, keyset-paginated on (created_at, id).
+            models.Index(
+                fields=["status", "-created_at", "-id"], name="jobs_job_status_created_idx"
+            ),
+            # Employer dashboard.
+            models.Index(
+                fields=["posted_by", "-created_at"], name="jobs_job_poster_created_idx"
+            ),
+            # Deadline auto-closer: seeks straight to expired open jobs.
+            models.Index(
+                fields=["status", "application_deadline"], name="jobs_job_status_deadline_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -84,11 +110,58 @@ class JobApplication(models.Model):
     feedback = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
+    # MinHash signature of the application and CV text (see jobs.duplicates).
+    minhash = models.BinaryField(null=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "applicant"], name="jobs_unique_application_per_job"
+            ),
+        ]
+        indexes = [
+            # Applicants page.
+            models.Index(
+                fields=["job", "-submitted_at"], name="jobs_app_job_submitted_idx"
+            ),
+            # Applicant dashboard. Partial, because boolean filters compile to
+            # a bare column test that a plain composite index cannot seek on.
+            models.Index(
+                fields=["applicant", "-submitted_at"],
+                condition=models.Q(is_active=True),
+                name="jobs_app_applicant_active_idx",
+            ),
+            # Admin changelist: status filter and the submitted_at date
+            # hierarchy, both newest first.
+            models.Index(
+                fields=["status", "-submitted_at"], name="jobs_app_status_submitted_idx"
+            ),
+            models.Index(fields=["-submitted_at"], name="jobs_app_submitted_idx"),
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.job.title}"
 
 
+class MinHashBucket(models.Model):
+    """
+    One LSH band of an application's MinHash signature. Applications to the
+    same job that share a (band, key) are near-duplicate candidates.
+    """
+
+    application = models.ForeignKey(
+        JobApplication, on_delete=models.CASCADE, related_name="minhash_buckets"
+    )
+    job = models.ForeignKey(JobPosition, on_delete=models.CASCADE, related_name="+")
+    band = models.PositiveSmallIntegerField()
+    key = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["job", "band", "key"], name="jobs_minhash_bucket_idx"),
+        ]
+
+
 class Notification(models.Model):
     recipient = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="notifications"
@@ -97,5 +170,167 @@ class Notification(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Unread notifications per user.
+            models.Index(
+                fields=["recipient", "-created_at"],
+                condition=models.Q(is_read=False),
+                name="jobs_notif_unread_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"Notification for {self.recipient.username}"
+
+
+class StoredFile(models.Model):
+    """
+    A content-addressed upload shared by every row that references it.
+    """
+
+    digest = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to="cvs/", max_length=255)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.digest
+
+
+class UploadSession(models.Model):
+    """
+    A resumable upload: chunks are appended until `offset` reaches `size`.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    stored_file = models.ForeignKey(
+        StoredFile, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @property
+    def is_complete(self):
+        return self.stored_file_id is not None
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+
+class JobPositionSearch(models.Model):
+    """
+    Read-only view of the full-text index kept in sync with JobPosition.
+    On SQLite this is the FTS5 table created by migration 0004.
+    """
+
+    job = models.OneToOneField(
+        JobPosition,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="rowid",
+        related_name="search_entry",
+    )
+    # FTS5 exposes a hidden column named after the table for whole-row MATCH.
+    document = models.TextField(db_column="jobs_jobposition_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "jobs_jobposition_fts"
+
+
+class CVDocument(models.Model):
+    """
+    Plain text extracted from a stored CV, shared by every row pointing at it.
+    """
+
+    file_name = models.CharField(max_length=255, unique=True)
+    text = models.TextField(blank=True)
+    error = models.CharField(max_length=255, blank=True)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.file_name
+
+
+class CVDocumentSearch(models.Model):
+    """
+    Read-only view of the full-text index over CVDocument.text.
+    On SQLite this is the FTS5 table created by migration 0006.
+    """
+
+    document_entry = models.OneToOneField(
+        CVDocument,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="rowid",
+        related_name="search_entry",
+    )
+    document = models.TextField(db_column="jobs_cvdocument_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "jobs_cvdocument_fts"
+
+
+class ArchivedRecord(models.Model):
+    """
+    A row moved out of its hot table by the archive_records command. The
+    columns the history pages filter and sort on are kept; the rest of the
+    original row is in `payload` as zlib-compressed JSON.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    payload = models.BinaryField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        abstract = True
+
+    @cached_property
+    def record(self):
+        return json.loads(zlib.decompress(self.payload))
+
+
+class ArchivedJobPosition(ArchivedRecord):
+    posted_by = models.ForeignKey(User, on_delete=models.CASCADE)
+    title = models.CharField(max_length=200)
+    created_at = models.DateTimeField()
+    application_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["posted_by", "-created_at"], name="jobs_arcjob_poster_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedJobApplication(ArchivedRecord):
+    # The job may be archived or still live, so this is not a foreign key.
+    job_id = models.BigIntegerField()
+    job_title = models.CharField(max_length=200)
+    applicant = models.ForeignKey(User, on_delete=models.CASCADE)
+    status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES)
+    is_active = models.BooleanField()
+    submitted_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["applicant", "-submitted_at"], name="jobs_arcapp_applicant_idx"
+            ),
+            models.Index(fields=["job_id", "-submitted_at"], name="jobs_arcapp_job_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.record['full_name']} - {self.job_title}"
@@ -0,0 +1,241 @@
+import base64
+import json
+import math
+from datetime import datetime
+
+from django.core.exceptions import BadRequest
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Below this many rows an exact COUNT(*) is cheap enough to run.
+ESTIMATE_THRESHOLD = 10000
+
+
+class KeysetPage:
+    """
+    One page of a keyset-paginated listing.
+    """
+
+    def __init__(self, items, next_cursor, page_size):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.page_size = page_size
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _encode(value, pk):
+    raw = f"{value}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor, parse):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, pk = base64.urlsafe_b64decode(padded).decode().split("|")
+        return parse(value), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise BadRequest("Invalid page cursor.")
+
+
+def encode_cursor(created_at, pk):
+    return _encode(created_at.isoformat(), pk)
+
+
+def decode_cursor(cursor):
+    """
+    Returns the (created_at, id) pair stored in a cursor.
+    Raises BadRequest if the cursor was tampered with.
+    """
+    return _decode(cursor, datetime.fromisoformat)
+
+
+def encode_rank_cursor(rank, pk):
+    # repr() round-trips a float exactly, so ties compare equal.
+    return _encode(repr(float(rank)), pk)
+
+
+def decode_rank_cursor(cursor):
+    """
+    Returns the (rank, id) pair stored in a search cursor.
+    Raises BadRequest if the cursor was tampered with.
+    """
+    rank, pk = _decode(cursor, float)
+    if not math.isfinite(rank):
+        raise BadRequest("Invalid page cursor.")
+    return rank, pk
+
+
+def get_page_size(value):
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def seek(queryset, created_at, pk):
+    """
+    Restricts `queryset` to rows that sort after (created_at, pk), newest first.
+    """
+    # The redundant created_at__lte bound gives the index a range to seek
+    # to; the OR alone is not sargable on SQLite.
+    return queryset.filter(created_at__lte=created_at).filter(
+        Q(created_at__lt=created_at) | Q(id__lt=pk)
+    )
+
+
+def paginate_keyset(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Returns the page of `queryset` that follows `cursor`, newest first.
+    Seeks on (created_at, id) so every page costs the same single query.
+    """
+    # Fetch one extra row to know whether another page exists.
+    items = list(_page_queryset(queryset, cursor, page_size))
+    return _build_page(items, page_size)
+
+
+async def apaginate_keyset(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Async counterpart of paginate_keyset.
+    """
+    items = [item async for item in _page_queryset(queryset, cursor, page_size)]
+    return _build_page(items, page_size)
+
+
+def _page_queryset(queryset, cursor, page_size):
+    queryset = queryset.order_by("-created_at", "-id")
+    if cursor:
+        queryset = seek(queryset, *decode_cursor(cursor))
+    return queryset[: page_size + 1]
+
+
+def _build_page(items, page_size, encode=lambda item: encode_cursor(item.created_at, item.pk)):
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode(items[-1])
+    return KeysetPage(items, next_cursor, page_size)
+
+
+def _ranked_page_queryset(queryset, cursor, page_size):
+    if cursor:
+        rank, pk = decode_rank_cursor(cursor)
+        # Ties on rank fall back to id, newest first, as rank_matching orders.
+        better = "rank__lt" if queryset.query.order_by[0] == "-rank" else "rank__gt"
+        queryset = queryset.filter(Q(**{better: rank}) | Q(rank=rank, id__lt=pk))
+    return queryset[: page_size + 1]
+
+
+def _encode_ranked(item):
+    return encode_rank_cursor(item.rank, item.pk)
+
+
+def paginate_ranked(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Returns the page of search results that follows `cursor`. Expects the
+    queryset from search.rank_matching, ordered on (rank, -id) or
+    (-rank, -id), and seeks on that pair instead of counting and offsetting.
+    """
+    items = list(_ranked_page_queryset(queryset, cursor, page_size))
+    return _build_page(items, page_size, _encode_ranked)
+
+
+async def apaginate_ranked(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Async counterpart of paginate_ranked.
+    """
+    items = [item async for item in _ranked_page_queryset(queryset, cursor, page_size)]
+    return _build_page(items, page_size, _encode_ranked)
+
+
+def estimated_count(model, using="default"):
+    """
+    Returns the planner's row estimate for `model`'s table, or None when the
+    database has no statistics for it (run ANALYZE to collect them).
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            row = cursor.fetchone()
+            return row[0] if row and row[0] >= 0 else None
+        if connection.vendor == "sqlite":
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            # Each index's entry starts with its row count. Partial indexes
+            # cover fewer rows than the table, so the largest is taken.
+            cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [table])
+            counts = [int(stat.split()[0]) for stat, in cursor.fetchall()]
+            return max(counts) if counts else None
+    return None
+
+
+def estimated_query_count(queryset):
+    """
+    Returns the planner's row estimate for `queryset`, or None on databases
+    whose query plans carry no row counts.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that estimates the size of large listings instead of counting
+    every row. An unfiltered table's size comes from the planner statistics.
+    A filtered listing is counted up to ESTIMATE_THRESHOLD rows past
+    `first_row`, the first row of the page being viewed; past that the
+    planner's estimate for the query is used, or on databases without one
+    the rows counted. Counting from the current page keeps the pages after
+    it linked, so every page can be reached. `is_estimate` is set when the
+    count is not exact.
+    """
+
+    def __init__(self, *args, first_row=0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.first_row = first_row
+        self.is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query"):
+            return super().count
+        if not queryset.query.where:
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate is None or estimate <= ESTIMATE_THRESHOLD:
+                return super().count
+            # Stale statistics can put the estimate short of the page
+            # asked for; that page is counted up to instead.
+            if estimate > self.first_row:
+                self.is_estimate = True
+                return estimate
+        limit = self.first_row + ESTIMATE_THRESHOLD
+        counted = queryset.order_by()[:limit + 1].count()
+        if counted <= limit:
+            return counted
+        self.is_estimate = True
+        return max(estimated_query_count(queryset) or 0, counted)
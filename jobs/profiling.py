@@ -0,0 +1,206 @@
+"""
+Opt-in per-request profiling.
+
+A sampled request records its wall time, SQL query count and time, its
+slowest queries with the line of project code that issued them, template
+render time and response size. The summary is sent back as a Server-Timing
+header, logged to the "jobs.profiling" logger and kept in an in-process ring
+buffer (see recent_profiles).
+
+Enable it with REQUEST_PROFILING_SAMPLE_RATE, the fraction of requests to
+profile, and time templates by using ProfilingTemplates as the TEMPLATES
+backend. Requests that are not sampled pay for one random() call, and their
+queries and template renders for one context variable lookup each. The
+middleware runs in sync and async chains alike, so it profiles the same
+handler mode that serves unsampled traffic.
+"""
+import collections
+import contextlib
+import contextvars
+import heapq
+import logging
+import random
+import time
+import traceback
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger("jobs.profiling")
+
+_active = contextvars.ContextVar("request_profile", default=None)
+_buffer = collections.deque(maxlen=getattr(settings, "REQUEST_PROFILING_BUFFER_SIZE", 200))
+
+
+def recent_profiles():
+    """
+    Returns the profiles kept by this process, oldest first.
+    """
+    return list(_buffer)
+
+
+class ProfiledTemplate(Template):
+    def render(self, context=None, request=None):
+        profile = _active.get()
+        if profile is None or profile.rendering:
+            return super().render(context, request)
+        # Nested renders (inclusion tags, widgets) count towards the outer one.
+        profile.rendering = True
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            profile.template_time += time.perf_counter() - start
+            profile.rendering = False
+
+
+class ProfilingTemplates(DjangoTemplates):
+    """
+    DjangoTemplates backend whose templates time their renders inside a
+    sampled request.
+    """
+
+    def from_string(self, template_code):
+        return ProfiledTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return ProfiledTemplate(template.template, self)
+
+
+def _timed_execute(execute, sql, params, many, context):
+    profile = _active.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs):
+    # Installed on every connection rather than per request: async views
+    # query through sync_to_async on another thread's connection, but the
+    # context variable follows them there. Reconnecting fires this again on
+    # the same wrapper, so it is only added once.
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_timed_execute)
+
+
+def _origin():
+    """
+    Returns "path:line in function" for the innermost project frame.
+    """
+    base = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        if (
+            frame.filename.startswith(base)
+            and frame.filename != __file__
+            and "site-packages" not in frame.filename
+        ):
+            return f"{frame.filename[len(base) + 1:]}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+class RequestProfile:
+    def __init__(self, slow_query_limit):
+        self.start = time.perf_counter()
+        self.query_count = 0
+        self.query_time = 0.0
+        self.template_time = 0.0
+        self.rendering = False
+        self.slow_query_limit = slow_query_limit
+        # Min-heap of (duration, sequence, sql, origin).
+        self.slow_queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.query_count += 1
+            self.query_time += duration
+            # Walking the stack is the expensive part, so only do it for
+            # queries that make the slowest list.
+            if len(self.slow_queries) < self.slow_query_limit:
+                heapq.heappush(self.slow_queries, (duration, self.query_count, sql, _origin()))
+            elif duration > self.slow_queries[0][0]:
+                heapq.heapreplace(self.slow_queries, (duration, self.query_count, sql, _origin()))
+
+    def summary(self, request, response, wall_time):
+        return {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "wall_ms": round(wall_time * 1000, 2),
+            "sql_count": self.query_count,
+            "sql_ms": round(self.query_time * 1000, 2),
+            "template_ms": round(self.template_time * 1000, 2),
+            "response_bytes": None if response.streaming else len(response.content),
+            "slow_queries": [
+                {"ms": round(duration * 1000, 2), "sql": sql, "origin": origin}
+                for duration, _, sql, origin in sorted(self.slow_queries, reverse=True)
+            ],
+        }
+
+
+def server_timing(summary):
+    return ", ".join([
+        f"total;dur={summary['wall_ms']}",
+        f'sql;dur={summary["sql_ms"]};desc="{summary["sql_count"]} queries"',
+        f"tpl;dur={summary['template_ms']}",
+    ])
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.sample_rate = getattr(settings, "REQUEST_PROFILING_SAMPLE_RATE", 0)
+        if not self.sample_rate:
+            raise MiddlewareNotUsed
+        self.slow_query_limit = getattr(settings, "REQUEST_PROFILING_SLOW_QUERIES", 5)
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @contextlib.contextmanager
+    def _profiling(self):
+        profile = RequestProfile(self.slow_query_limit)
+        token = _active.set(profile)
+        try:
+            yield profile
+        finally:
+            _active.reset(token)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        with self._profiling() as profile:
+            response = self.get_response(request)
+        return self._report(request, response, profile)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+        with self._profiling() as profile:
+            response = await self.get_response(request)
+        return self._report(request, response, profile)
+
+    def _report(self, request, response, profile):
+        summary = profile.summary(request, response, time.perf_counter() - profile.start)
+        response["Server-Timing"] = server_timing(summary)
+        _buffer.append(summary)
+        logger.info(
+            "%(method)s %(path)s %(status)s %(wall_ms)sms sql=%(sql_count)s/%(sql_ms)sms "
+            "tpl=%(template_ms)sms bytes=%(response_bytes)s",
+            summary,
+            extra={"profile": summary},
+        )
+        return response
@@ -0,0 +1,62 @@
+"""
+Sends reads from read-only views to the "replica" database alias.
+
+Only views wrapped in read_only_view use the replica, and only for this
+app's models; sessions and users always come from the primary so a fresh
+login is never lost to replication lag. Without a "replica" alias every
+query goes to "default".
+"""
+import contextvars
+import functools
+
+from asgiref.sync import iscoroutinefunction
+from django.db import connections
+
+REPLICA = "replica"
+
+_use_replica = contextvars.ContextVar("use_replica", default=False)
+
+
+def read_only_view(view):
+    if iscoroutinefunction(view):
+
+        @functools.wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            token = _use_replica.set(True)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _use_replica.reset(token)
+
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = _use_replica.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (
+            _use_replica.get()
+            and model._meta.app_label == "jobs"
+            and REPLICA in connections.settings
+        ):
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
@@ -0,0 +1,133 @@
+import re
+
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connections
+from django.db.models import Count, F, FloatField, Lookup, Q, Value
+
+from .models import CVDocumentSearch, JobPositionSearch
+
+SEARCH_FIELDS = ("title", "description", "required_skills")
+FACET_FIELDS = ("location", "job_type")
+
+
+class Match(Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", (*lhs_params, *rhs_params)
+
+
+JobPositionSearch._meta.get_field("document").register_lookup(Match)
+CVDocumentSearch._meta.get_field("document").register_lookup(Match)
+
+
+def build_fts_query(text):
+    """
+    Turns free text into an FTS5 query that ANDs every word.
+    Quoting each term keeps user punctuation out of the FTS5 syntax.
+    """
+    terms = re.findall(r"\w+", text)
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def _postgres_query(text):
+    from django.contrib.postgres.search import SearchQuery
+
+    return SearchQuery(text, config="english", search_type="websearch")
+
+
+def _filter_indexed(queryset, fields, text):
+    # On SQLite the model's `search_entry` relation joins its FTS5 table; on
+    # PostgreSQL the vector matches the GIN expression index in migrations.
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        fts_query = build_fts_query(text)
+        if not fts_query:
+            return queryset.none()
+        return queryset.filter(search_entry__document__match=fts_query)
+    if vendor == "postgresql":
+        from django.contrib.postgres.search import SearchVector
+
+        return queryset.annotate(
+            search=SearchVector(*fields, config="english")
+        ).filter(search=_postgres_query(text))
+    return _filter_unindexed(queryset, fields, text)
+
+
+def _filter_unindexed(queryset, fields, text):
+    # Other backends have no full-text index wired up; match every word
+    # somewhere in the fields instead. This scans, but it does not fail.
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return queryset.none()
+    return queryset.filter(
+        reduce(
+            and_,
+            (reduce(or_, (Q(**{f"{field}__icontains": term}) for field in fields)) for term in terms),
+        )
+    )
+
+
+def filter_matching(queryset, text):
+    """
+    Restricts `queryset` to jobs matching `text` through the full-text index.
+    """
+    return _filter_indexed(queryset, SEARCH_FIELDS, text)
+
+
+def filter_cv_matching(queryset, text):
+    """
+    Restricts a CVDocument queryset to CVs whose text matches `text`.
+    """
+    return _filter_indexed(queryset, ("text",), text)
+
+
+def rank_matching(queryset, text):
+    """
+    Returns the jobs matching `text`, best match first.
+    """
+    queryset = filter_matching(queryset, text)
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        # bm25() scores are negative; lower is a better match.
+        return queryset.annotate(rank=F("search_entry__rank")).order_by("rank", "-id")
+    if vendor != "postgresql":
+        # Unranked: every match ties, so results come newest first.
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField())).order_by(
+            "-rank", "-id"
+        )
+
+    from django.contrib.postgres.search import SearchRank, SearchVector
+
+    weighted = (
+        SearchVector("title", weight="A", config="english")
+        + SearchVector("required_skills", weight="B", config="english")
+        + SearchVector("description", weight="C", config="english")
+    )
+    return queryset.annotate(rank=SearchRank(weighted, _postgres_query(text))).order_by(
+        "-rank", "-id"
+    )
+
+
+def _facet_rows(queryset, field):
+    return (
+        queryset.order_by()
+        .values_list(field)
+        .annotate(count=Count("id"))
+        .order_by("-count", field)
+    )
+
+
+def facet_counts(queryset, field):
+    """
+    Returns [(value, count), ...] for `field`, most common first.
+    """
+    return list(_facet_rows(queryset, field))
+
+
+async def afacet_counts(queryset, field):
+    return [row async for row in _facet_rows(queryset, field)]
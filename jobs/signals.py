@@ -0,0 +1,62 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .archive import is_archiving
+from .cache import invalidate_company_info, invalidate_job_pages, invalidate_pages
+from .cv_text import queue_cv_extraction
+from .duplicates import TEXT_FIELDS, queue_duplicate_indexing
+from .models import (
+    ArchivedJobApplication,
+    CompanyInfo,
+    JobApplication,
+    JobPosition,
+    Profile,
+    UploadSession,
+)
+from .uploads import release_file, remove_partial
+
+
+@receiver([post_save, post_delete], sender=CompanyInfo)
+def company_info_changed(sender, **kwargs):
+    invalidate_company_info()
+    invalidate_pages()
+
+
+@receiver([post_save, post_delete], sender=JobPosition)
+def job_position_changed(sender, instance, **kwargs):
+    invalidate_job_pages(instance.pk)
+
+
+@receiver(post_delete, sender=JobApplication)
+def job_application_deleted(sender, instance, **kwargs):
+    # Archiving hands the file reference over to the archive row.
+    if not is_archiving():
+        release_file(instance.cv_file.name)
+
+
+@receiver(post_delete, sender=ArchivedJobApplication)
+def archived_application_deleted(sender, instance, **kwargs):
+    release_file(instance.record["cv_file"])
+
+
+@receiver(post_delete, sender=Profile)
+def profile_deleted(sender, instance, **kwargs):
+    release_file(instance.cv.name)
+
+
+@receiver(post_delete, sender=UploadSession)
+def upload_session_deleted(sender, instance, **kwargs):
+    remove_partial(instance)
+
+
+@receiver(post_save, sender=JobApplication)
+def job_application_saved(sender, instance, update_fields=None, **kwargs):
+    # Indexing extracts the CV first, so its text is part of the signature.
+    if update_fields is None or TEXT_FIELDS.intersection(update_fields):
+        queue_duplicate_indexing(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or "cv" in update_fields:
+        queue_cv_extraction(instance.cv.name)
@@ -0,0 +1,75 @@
+/**
+ * Resumable chunked uploads.
+ *
+ * uploadInChunks(file, createUrl, csrfToken, onProgress) creates an upload
+ * session, sends the file in chunks and resolves with the finished session.
+ * After a failed chunk it asks the server how far it got and resumes from
+ * there instead of starting over.
+ */
+function uploadInChunks(file, createUrl, csrfToken, onProgress) {
+    const MAX_RETRIES = 5;
+
+    function sleep(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    async function createSession() {
+        const formData = new FormData();
+        formData.append("filename", file.name);
+        formData.append("size", file.size);
+        const response = await fetch(createUrl, {
+            method: "POST",
+            body: formData,
+            headers: { "X-CSRFToken": csrfToken },
+        });
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.errors || "Upload failed.");
+        }
+        return data;
+    }
+
+    async function sendChunk(session, offset) {
+        const response = await fetch(session.upload_url, {
+            method: "PUT",
+            body: file.slice(offset, offset + session.chunk_size),
+            headers: {
+                "X-CSRFToken": csrfToken,
+                "Upload-Offset": String(offset),
+                "Content-Type": "application/octet-stream",
+            },
+        });
+        // 409 means the server is elsewhere; its offset is in the body.
+        if (!response.ok && response.status !== 409) {
+            throw new Error("Chunk upload failed.");
+        }
+        return response.json();
+    }
+
+    async function currentOffset(session) {
+        const response = await fetch(session.upload_url);
+        return (await response.json()).offset;
+    }
+
+    return (async () => {
+        const session = await createSession();
+        let state = session;
+        let retries = 0;
+        while (!state.complete) {
+            try {
+                state = await sendChunk(session, state.offset);
+                retries = 0;
+                if (onProgress) {
+                    onProgress(state.offset, file.size);
+                }
+            } catch (error) {
+                if (++retries > MAX_RETRIES) {
+                    throw error;
+                }
+                await sleep(1000 * retries);
+                state = { ...state, offset: await currentOffset(session).catch(() => state.offset) };
+            }
+        }
+        return state;
+    })();
+}
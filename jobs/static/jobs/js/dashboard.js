@@ -2,6 +2,7 @@ document.addEventListener('DOMContentLoaded', function () {
     const scriptTag = document.querySelector('script[src*="dashboard.js"]');
     const profileImageUploadUrl = scriptTag.dataset.profileImageUploadUrl;
     const cvUploadUrl = scriptTag.dataset.cvUploadUrl;
+    const uploadCreateUrl = scriptTag.dataset.uploadCreateUrl;
 
     const uploadProfileImageBtn = document.getElementById('upload-profile-image-btn');
     const uploadCvBtn = document.getElementById('upload-cv-btn');
@@ -36,7 +37,16 @@ document.addEventListener('DOMContentLoaded', function () {
             })
             .then(response => response.json())
             .then(data => {
-                if (data.success) {
+                if (data.success && data.pending) {
+                    showNotification('Processing profile image...');
+                    waitForProfileImage(data.status_url, function (url) {
+                        const img = document.querySelector('.profile-image img');
+                        // Drop the stale WebP <source> so the new image shows.
+                        img.parentElement.querySelectorAll('source').forEach(source => source.remove());
+                        img.src = url;
+                        showNotification('Profile image updated successfully.');
+                    });
+                } else if (data.success) {
                     document.querySelector('.profile-image img').src = data.profile_image_url;
                     showNotification('Profile image updated successfully.');
                 }
@@ -46,15 +56,21 @@ document.addEventListener('DOMContentLoaded', function () {
 
     if (cvInput) {
         cvInput.addEventListener('change', function () {
-            const formData = new FormData();
-            formData.append('cv', this.files[0]);
+            const file = this.files[0];
+            showNotification('Uploading CV...');
 
-            fetch(cvUploadUrl, {
-                method: 'POST',
-                body: formData,
-                headers: {
-                    'X-CSRFToken': getCookie('csrftoken')
-                }
+            // Send the file in resumable chunks, then attach it to the profile.
+            uploadInChunks(file, uploadCreateUrl, getCookie('csrftoken'))
+            .then(upload => {
+                const formData = new FormData();
+                formData.append('upload_id', upload.upload_id);
+                return fetch(cvUploadUrl, {
+                    method: 'POST',
+                    body: formData,
+                    headers: {
+                        'X-CSRFToken': getCookie('csrftoken')
+                    }
+                });
             })
             .then(response => response.json())
             .then(data => {
@@ -72,6 +88,23 @@ document.addEventListener('DOMContentLoaded', function () {
         });
     }
 
+    // Polls the status endpoint until the background resize has finished.
+    function waitForProfileImage(statusUrl, onReady) {
+        setTimeout(function () {
+            fetch(statusUrl)
+                .then(response => response.json())
+                .then(data => {
+                    if (data.pending) {
+                        waitForProfileImage(statusUrl, onReady);
+                    } else if (data.success) {
+                        onReady(data.profile_image_url);
+                    } else {
+                        showNotification(data.error || 'Profile image upload failed.');
+                    }
+                });
+        }, 1000);
+    }
+
     function getCookie(name) {
         let cookieValue = null;
         if (document.cookie && document.cookie !== '') {
@@ -109,7 +109,10 @@ document.addEventListener("DOMContentLoaded", function () {
         })
         .then(response => response.json())
         .then(data => {
-            if (data.success) {
+            if (data.success && data.pending) {
+                showStatusMessage("Processing...", "info");
+                waitForProfileImage(data.status_url);
+            } else if (data.success) {
                 imagePreview.src = data.profile_image_url + `?t=${new Date().getTime()}`; // Add timestamp to break cache
                 showStatusMessage("Profile image updated successfully.", "success");
             } else {
@@ -123,6 +126,28 @@ document.addEventListener("DOMContentLoaded", function () {
         });
     }
 
+    // Poll until the background resize has produced the new image
+    function waitForProfileImage(statusUrl) {
+        setTimeout(() => {
+            fetch(statusUrl)
+            .then(response => response.json())
+            .then(data => {
+                if (data.pending) {
+                    waitForProfileImage(statusUrl);
+                } else if (data.success) {
+                    imagePreview.src = data.profile_image_url;
+                    showStatusMessage("Profile image updated successfully.", "success");
+                } else {
+                    showStatusMessage(data.error || "Upload failed.", "error");
+                }
+            })
+            .catch(error => {
+                console.error("Error:", error);
+                showStatusMessage("An unexpected error occurred.", "error");
+            });
+        }, 1000);
+    }
+
     // Handle remove button click
     if (removeButton) {
         removeButton.addEventListener("click", () => {
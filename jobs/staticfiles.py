@@ -0,0 +1,168 @@
+"""
+Fingerprinted, precompressed static files.
+
+CompressedManifestStorage hashes file names through a manifest and writes
+gzip and brotli variants next to each compressible file during
+collectstatic. StaticFilesMiddleware serves STATIC_ROOT from the app server:
+it picks the best pre-encoded variant for the client's Accept-Encoding and
+marks fingerprinted files as immutable, so nothing is compressed or
+revalidated per request.
+"""
+import gzip
+import mimetypes
+import os
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.files.base import ContentFile
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".svg", ".json", ".map", ".txt", ".html", ".xml", ".ico")
+# Variants that do not save at least this fraction are not worth serving.
+MIN_SAVING = 0.05
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Unhashed names can change content under the same URL.
+SHORT_CACHE_CONTROL = "public, max-age=60"
+# Preferred first.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _encoders():
+    encoders = {".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoders[".br"] = lambda data: brotli.compress(data, quality=11)
+    return encoders
+
+
+class CompressedManifestStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        encoders = _encoders()
+        for name in sorted(names):
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS) or not self.exists(name):
+                continue
+            with self.open(name) as original:
+                data = original.read()
+            for suffix, encode in encoders.items():
+                compressed = encode(data)
+                if len(compressed) <= len(data) * (1 - MIN_SAVING):
+                    if self.exists(name + suffix):
+                        self.delete(name + suffix)
+                    self._save(name + suffix, ContentFile(compressed))
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Not collected yet (tests, fresh checkouts): use the source name.
+            # With a manifest in production a missing entry is a real error.
+            if settings.DEBUG or not self.hashed_files:
+                return name
+            raise
+
+
+def accepted_encodings(header):
+    """
+    Returns {coding: q} for an Accept-Encoding header. Codings with q=0 are
+    refused.
+    """
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+class StaticFilesMiddleware:
+    """
+    Serves collected static files. The file list is read once at startup,
+    so requests never touch the filesystem to find a file.
+
+    Works in both sync and async chains, so async views stay on the event
+    loop under ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.prefix = "/" + settings.STATIC_URL.lstrip("/")
+        self.files = self._scan(settings.STATIC_ROOT) if settings.STATIC_ROOT else {}
+        # Fingerprinted names listed in the manifest never change content.
+        self.immutable = set(getattr(staticfiles_storage, "hashed_files", {}).values())
+
+    @staticmethod
+    def _scan(root):
+        files = {}
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, root).replace(os.sep, "/")
+                files[name] = path
+        return files
+
+    def _static_name(self, request):
+        if request.method in ("GET", "HEAD") and request.path.startswith(self.prefix):
+            name = request.path[len(self.prefix):]
+            if name in self.files and not name.endswith((".gz", ".br")):
+                return name
+        return None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        name = self._static_name(request)
+        if name is not None:
+            return self.serve(request, name)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        name = self._static_name(request)
+        if name is not None:
+            return self.serve(request, name)
+        return await self.get_response(request)
+
+    def serve(self, request, name):
+        accepted = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+        path, encoding = self.files[name], None
+        for candidate, suffix in ENCODINGS:
+            quality = accepted.get(candidate, accepted.get("*", 0))
+            if quality > 0 and name + suffix in self.files:
+                path, encoding = self.files[name + suffix], candidate
+                break
+        content_type, _ = mimetypes.guess_type(name)
+        response = FileResponse(
+            open(path, "rb"), content_type=content_type or "application/octet-stream"
+        )
+        if encoding:
+            response["Content-Encoding"] = encoding
+        response["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL if name in self.immutable else SHORT_CACHE_CONTROL
+        )
+        if any(name + suffix in self.files for _, suffix in ENCODINGS):
+            patch_vary_headers(response, ["Accept-Encoding"])
+        return response
@@ -0,0 +1,274 @@
+"""
+Deterministic synthetic data for measuring performance at production scale.
+
+Every table is generated in fixed-size chunks. A chunk's rows depend only on
+the seed, the table, the chunk's first row and the plan's reference time, so
+the same seed, batch size and reference time produce the same rows whether
+the chunks run in one process or many. Primary keys continue from the rows
+already in each table, so runs match exactly when they start from the same
+database.
+"""
+import contextlib
+import datetime
+import multiprocessing
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import JobApplication, JobPosition, Notification, Profile
+
+SKILLS = (
+    "Python", "Django", "JavaScript", "React", "SQL", "PostgreSQL", "AWS",
+    "Docker", "Kubernetes", "Java", "Go", "Rust", "HTML", "CSS", "Pandas",
+    "NumPy", "Machine Learning", "Excel", "Communication", "Project Management",
+)
+TITLES = (
+    "Software Engineer", "Data Analyst", "Product Manager", "DevOps Engineer",
+    "Frontend Developer", "Backend Developer", "Data Scientist", "QA Engineer",
+    "Support Specialist", "Sales Associate",
+)
+LOCATIONS = (
+    "Remote", "New York, NY", "San Francisco, CA", "London", "Berlin",
+    "Paris", "Nairobi", "Lagos", "Toronto", "Sydney",
+)
+JOB_TYPES = [choice for choice, _ in JobPosition.JOB_TYPE_CHOICES]
+APPLICATION_STATUSES = [choice for choice, _ in JobApplication.STATUS_CHOICES]
+TABLE_CODES = {"users": 1, "profiles": 2, "jobs": 3, "applications": 4, "notifications": 5}
+# Timestamps are spread over the HISTORY_DAYS before the reference time.
+HISTORY_DAYS = 730
+PASSWORD = "password123"
+
+
+class Plan:
+    """
+    Row counts, first primary keys and chunking for one synthetic run.
+    Posters take the first user ids; the rest are applicants. `now` is the
+    reference time for generated timestamps, the current time by default.
+    """
+
+    def __init__(
+        self, users, jobs, applications, notifications, seed=0, batch_size=5000, now=None
+    ):
+        self.users = users
+        self.posters = max(users // 10, 1)
+        self.jobs = jobs
+        self.applications = min(applications, jobs * (users - self.posters))
+        self.notifications = notifications
+        self.seed = seed
+        self.batch_size = batch_size
+        self.now = now or timezone.now()
+        # A fixed salt, so the stored hash depends only on the seed.
+        self.password = make_password(PASSWORD, salt=f"synthetic{seed}")
+        self.user_base = self._next_id(User)
+        self.profile_base = self._next_id(Profile)
+        self.job_base = self._next_id(JobPosition)
+        self.application_base = self._next_id(JobApplication)
+        self.notification_base = self._next_id(Notification)
+
+    @staticmethod
+    def _next_id(model):
+        return (model.objects.aggregate(top=Max("pk"))["top"] or 0) + 1
+
+    def count(self, table):
+        return {
+            "users": self.users,
+            "profiles": self.users,
+            "jobs": self.jobs,
+            "applications": self.applications,
+            "notifications": self.notifications,
+        }[table]
+
+    def chunks(self, table):
+        total = self.count(table)
+        return [
+            (table, start, min(start + self.batch_size, total))
+            for start in range(0, total, self.batch_size)
+        ]
+
+    def rng(self, table, start):
+        return random.Random(f"{self.seed}:{TABLE_CODES[table]}:{start}")
+
+    def moment(self, rng):
+        return self.now - datetime.timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+
+
+@contextlib.contextmanager
+def explicit_timestamps(*fields):
+    """
+    Lets bulk_create keep the timestamps we generate instead of
+    auto_now_add overwriting them with the current time.
+    """
+    saved = [(field, field.auto_now_add) for field in fields]
+    for field, _ in saved:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, value in saved:
+            field.auto_now_add = value
+
+
+def _skills(rng, count):
+    return ", ".join(rng.sample(SKILLS, count))
+
+
+def _users(plan, rng, start, end):
+    return User, [
+        User(
+            id=plan.user_base + i,
+            username=f"synthetic{plan.user_base + i}",
+            email=f"synthetic{plan.user_base + i}@example.com",
+            first_name=f"User{i}",
+            password=plan.password,
+            date_joined=plan.moment(rng),
+        )
+        for i in range(start, end)
+    ]
+
+
+def _profiles(plan, rng, start, end):
+    return Profile, [
+        Profile(
+            id=plan.profile_base + i,
+            user_id=plan.user_base + i,
+            role="POSTER" if i < plan.posters else "APPLICANT",
+            skills="" if i < plan.posters else _skills(rng, rng.randint(2, 6)),
+            work_experience=f"{rng.randint(0, 15)} years of experience.",
+            education="B.Sc.",
+        )
+        for i in range(start, end)
+    ]
+
+
+def _jobs(plan, rng, start, end):
+    rows = []
+    for i in range(start, end):
+        created_at = plan.moment(rng)
+        title = rng.choice(TITLES)
+        rows.append(JobPosition(
+            id=plan.job_base + i,
+            title=f"{title} {i}",
+            description=f"We are hiring a {title.lower()} to join a growing team.",
+            required_skills=_skills(rng, rng.randint(3, 6)),
+            location=rng.choice(LOCATIONS),
+            job_type=rng.choice(JOB_TYPES),
+            application_deadline=(created_at + datetime.timedelta(days=rng.randint(14, 90))).date(),
+            posted_by_id=plan.user_base + rng.randrange(plan.posters),
+            # Recent jobs are mostly open, older ones mostly closed.
+            status="Open" if (plan.now - created_at).days < 60 or rng.random() < 0.05 else "Closed",
+            created_at=created_at,
+        ))
+    return JobPosition, rows
+
+
+def _applications(plan, rng, start, end):
+    applicants = plan.users - plan.posters
+    rows = []
+    for i in range(start, end):
+        # Walking jobs fastest keeps every (job, applicant) pair unique.
+        applicant_id = plan.user_base + plan.posters + (i // plan.jobs) % applicants
+        rows.append(JobApplication(
+            id=plan.application_base + i,
+            job_id=plan.job_base + i % plan.jobs,
+            applicant_id=applicant_id,
+            full_name=f"User{applicant_id - plan.user_base}",
+            email=f"synthetic{applicant_id}@example.com",
+            phone_number=f"555-{i % 10000:04d}",
+            skills=_skills(rng, rng.randint(2, 6)),
+            work_experience=f"{rng.randint(0, 15)} years of experience.",
+            education="B.Sc.",
+            cv_file="cvs/dummy_cv.pdf",
+            status=rng.choice(APPLICATION_STATUSES),
+            is_active=rng.random() < 0.9,
+            submitted_at=plan.moment(rng),
+        ))
+    return JobApplication, rows
+
+
+def _notifications(plan, rng, start, end):
+    return Notification, [
+        Notification(
+            id=plan.notification_base + i,
+            recipient_id=plan.user_base + plan.posters + rng.randrange(plan.users - plan.posters),
+            message="The status of your application has been updated.",
+            is_read=rng.random() < 0.7,
+            created_at=plan.moment(rng),
+        )
+        for i in range(start, end)
+    ]
+
+
+BUILDERS = {
+    "users": _users,
+    "profiles": _profiles,
+    "jobs": _jobs,
+    "applications": _applications,
+    "notifications": _notifications,
+}
+
+
+def write_chunk(plan, chunk):
+    table, start, end = chunk
+    model, rows = BUILDERS[table](plan, plan.rng(table, start), start, end)
+    timestamps = [
+        field for field in model._meta.concrete_fields if getattr(field, "auto_now_add", False)
+    ]
+    with explicit_timestamps(*timestamps), transaction.atomic():
+        model.objects.bulk_create(rows, batch_size=plan.batch_size)
+    return end - start
+
+
+_worker_plan = None
+
+
+def _init_worker(plan):
+    global _worker_plan
+    _worker_plan = plan
+    # Forked workers must not share the parent's database connection.
+    for conn in connections.all(initialized_only=True):
+        conn.inc_thread_sharing()
+        conn.close()
+        conn.dec_thread_sharing()
+
+
+def _write_in_worker(chunk):
+    return write_chunk(_worker_plan, chunk)
+
+
+def generate(plan, workers=1, progress=None):
+    """
+    Writes every table of `plan`, one table at a time so foreign keys always
+    point at committed rows. Chunks of a table are spread over `workers`
+    processes.
+    """
+    for table in BUILDERS:
+        chunks = plan.chunks(table)
+        if workers > 1 and len(chunks) > 1:
+            connections.close_all()
+            with multiprocessing.get_context("fork").Pool(
+                workers, initializer=_init_worker, initargs=(plan,)
+            ) as pool:
+                written = sum(pool.imap_unordered(_write_in_worker, chunks))
+        else:
+            written = sum(write_chunk(plan, chunk) for chunk in chunks)
+        if progress:
+            progress(table, written)
+    _reset_sequences()
+
+
+def _reset_sequences():
+    # Explicit primary keys leave PostgreSQL sequences behind.
+    if connection.vendor != "postgresql":
+        return
+    from django.core.management.color import no_style
+
+    statements = connection.ops.sequence_reset_sql(
+        no_style(), [User, Profile, JobPosition, JobApplication, Notification]
+    )
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
@@ -0,0 +1,40 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "BACKGROUND_TASK_WORKERS", 2),
+                thread_name_prefix="jobs-task",
+            )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", func.__qualname__)
+    finally:
+        # Worker threads hold their own connections; release them per task.
+        connections.close_all()
+
+
+def enqueue(func, *args, **kwargs):
+    """
+    Runs func(*args, **kwargs) on the background pool once the current
+    transaction commits, so the task sees the rows the request wrote.
+    """
+    transaction.on_commit(lambda: _get_executor().submit(_run, func, args, kwargs))
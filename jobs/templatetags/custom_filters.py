@@ -1,4 +1,7 @@
 from django import template
+from django.core.files.storage import default_storage
+
+from jobs.images import rendition_name
 
 register = template.Library()
 
@@ -11,3 +14,32 @@ def split(value, key):
     if value is None or value == "":
         return []
     return value.split(key)
+
+
+@register.simple_tag(takes_context=True)
+def url_replace(context, **kwargs):
+    """
+        Returns the current query string with the given parameters replaced.
+        Parameters passed as None or an empty string are dropped.
+    """
+    query = context["request"].GET.copy()
+    for key, value in kwargs.items():
+        if value is None or value == "":
+            query.pop(key, None)
+        else:
+            query[key] = value
+    return query.urlencode()
+
+
+@register.filter
+def rendition_url(picture, spec):
+    """
+        Returns the URL of another size/format of a processed profile picture,
+        e.g. {{ profile.profile_picture|rendition_url:"150.webp" }}.
+        Returns an empty string for pictures without renditions.
+    """
+    if not picture:
+        return ""
+    size, ext = spec.split(".")
+    name = rendition_name(picture.name, size, ext)
+    return default_storage.url(name) if name else ""
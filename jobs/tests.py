@@ -1,3 +1,1640 @@
-from django.test import TestCase
+import base64
+import csv
+import datetime
+import gzip
+import hashlib
+import html
+import importlib
+import io
+import json
+import logging
+import os
+import re
+import statistics
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import BadRequest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.template.backends.django import Template
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, reverse
+from django.utils import timezone
+from PIL import Image, UnidentifiedImageError
+
+from . import uploads
+from .admin import JobApplicationAdmin
+from .archive import archive_records
+from .cv_text import extract_text, index_cv, pending_cv_names
+from .deadlines import close_expired_jobs
+from .duplicates import (
+    ROWS,
+    band_keys,
+    flag_duplicates,
+    index_applications,
+    shingles,
+    signature,
+    similarity,
+)
+from .images import PROCESSING_FAILED, queue_profile_picture
+from .matching import score_skills
+from .models import (
+    ArchivedJobApplication,
+    ArchivedJobPosition,
+    CompanyInfo,
+    CVDocument,
+    JobApplication,
+    JobPosition,
+    MinHashBucket,
+    Notification,
+    Profile,
+    StoredFile,
+    UploadSession,
+)
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    EstimatedCountPaginator,
+    decode_cursor,
+    encode_cursor,
+    estimated_count,
+    get_page_size,
+    paginate_keyset,
+    paginate_ranked,
+)
+from .profiling import recent_profiles
+from .routers import REPLICA, ReplicaRouter, read_only_view
+from .search import facet_counts, filter_cv_matching, filter_matching, rank_matching
+from .staticfiles import StaticFilesMiddleware
+from .synthetic import Plan, generate
+from .uploads import MAX_CV_SIZE, content_name, partial_path
+from .urls import urlpatterns
+
+BASELINE_PATH = Path(__file__).with_name("query_baseline.json")
+# Rows added per relationship of the benchmark users at each data size.
+SIZES = (2, 12)
+REPEAT = 5
+
+
+def create_job(posted_by, **fields):
+    """
+    Creates an open job with placeholder text; `fields` override any of it.
+    """
+    return JobPosition.objects.create(
+        **{
+            "title": "Test Engineer",
+            "description": "Test job",
+            "required_skills": "Python",
+            "location": "Remote",
+            "job_type": "Full-time",
+            "application_deadline": "2099-01-01",
+            "posted_by": posted_by,
+            **fields,
+        }
+    )
+
+
+def create_application(job, applicant, **fields):
+    """
+    Creates an application with placeholder details; `fields` override any
+    of them.
+    """
+    return JobApplication.objects.create(
+        **{
+            "job": job,
+            "applicant": applicant,
+            "full_name": "Test Applicant",
+            "email": "applicant@example.com",
+            "phone_number": "555",
+            "skills": "Python",
+            "work_experience": "1 year",
+            "education": "B.Sc.",
+            "cv_file": "cvs/dummy_cv.pdf",
+            **fields,
+        }
+    )
+
+
+class RenderTimer:
+    """
+    Adds up the time spent rendering templates while active.
+    """
+
+    def __init__(self):
+        self.seconds = 0.0
+        self._render = Template.render
+
+    def __enter__(self):
+        timer = self
+
+        def render(template, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return timer._render(template, *args, **kwargs)
+            finally:
+                timer.seconds += time.perf_counter() - start
+
+        self._patch = mock.patch.object(Template, "render", render)
+        self._patch.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._patch.stop()
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def read_async_stream(response):
+    return b"".join([chunk async for chunk in response.streaming_content])
+
+
+class ViewBenchmarkTests(TestCase):
+    """
+    Drives every URL in jobs/urls.py at two data sizes. Fails when a view's
+    query count depends on the amount of data or exceeds the stored
+    baseline in query_baseline.json.
+
+    Regenerate the baseline with UPDATE_QUERY_BASELINE=1 and print the
+    latency report with BENCHMARK_REPORT=1.
+    """
+
+    results = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        CompanyInfo.objects.create(
+            name="Innovate Inc.",
+            description="Benchmark company",
+            email="contact@example.com",
+            phone="123",
+            address="1 Test Street",
+            logo="company/logo.svg",
+        )
+        # Background rows, so listings are not trivially small.
+        generate(Plan(users=40, jobs=20, applications=200, notifications=100, seed=1))
+        cls.poster = User.objects.create_user("bench-poster", password="password123")
+        Profile.objects.create(user=cls.poster, role="POSTER")
+        cls.applicant = User.objects.create_user("bench-applicant", password="password123")
+        cls.applicant_profile = Profile.objects.create(
+            user=cls.applicant, role="APPLICANT", skills="Python, Django", cv="cvs/dummy_cv.pdf"
+        )
+        cls.job = cls.create_job()
+        cls.other_job = cls.create_job()
+        cls.application = cls.create_application(cls.job, cls.applicant)
+        cls.upload = UploadSession.objects.create(user=cls.applicant, filename="cv.pdf", size=10)
+        cls.archived_job = cls.create_archived_job()
+        cls.grown = 0
+
+    @classmethod
+    def create_archived_job(cls):
+        job = cls.create_job()
+        cls.create_application(job, cls.applicant)
+        JobPosition.objects.filter(pk=job.pk).update(status="Closed")
+        archive_records(timezone.now())
+        return ArchivedJobPosition.objects.get(pk=job.pk)
+
+    @classmethod
+    def create_job(cls):
+        return create_job(
+            cls.poster,
+            title="Benchmark Engineer",
+            description="Benchmark job",
+            required_skills="Python, Django, SQL",
+        )
+
+    @staticmethod
+    def create_application(job, applicant):
+        return create_application(
+            job,
+            applicant,
+            full_name="Bench Applicant",
+            email="bench@example.com",
+            skills="Python, SQL",
+            work_experience="3 years",
+        )
+
+    def grow(self, size):
+        """
+        Gives the benchmark users `size` rows of everything their pages list.
+        """
+        for i in range(self.grown, size):
+            other = User.objects.create_user(f"bench-other-{i}")
+            Profile.objects.create(user=other, role="APPLICANT", skills="Python")
+            self.create_application(self.job, other)
+            self.create_application(self.create_job(), self.applicant)
+            Notification.objects.create(recipient=self.applicant, message=f"Update {i}")
+            self.create_archived_job()
+        # Benchmark applications are too short to sign; this times the lookup.
+        index_applications(JobApplication.objects.filter(job=self.job))
+        self.grown = size
+
+    def scenarios(self):
+        """
+        Maps each URL name to (user, method, path, data).
+        """
+        job, application = self.job, self.application
+        poster, applicant = self.poster, self.applicant
+        return {
+            "home": (None, "get", reverse("home"), None),
+            "job_list": (None, "get", reverse("job_list"), None),
+            "job_detail": (None, "get", reverse("job_detail", args=[job.id]), None),
+            "register": (None, "get", reverse("register"), None),
+            "login": (None, "get", reverse("login"), None),
+            "logout": (applicant, "get", reverse("logout"), None),
+            "apply_for_job": (
+                applicant, "get", reverse("apply_for_job", args=[self.other_job.id]), None
+            ),
+            "applicant_dashboard": (applicant, "get", reverse("applicant_dashboard"), None),
+            "applicant_profile": (applicant, "get", reverse("applicant_profile"), None),
+            "applicant_profile_edit": (applicant, "get", reverse("applicant_profile_edit"), None),
+            "withdraw_application": (
+                applicant, "get", reverse("withdraw_application", args=[application.id]), None
+            ),
+            "notifications": (applicant, "get", reverse("notifications"), None),
+            "applicant_history": (applicant, "get", reverse("applicant_history"), None),
+            "employer_history": (poster, "get", reverse("employer_history"), None),
+            "archived_job": (
+                poster, "get", reverse("archived_job", args=[self.archived_job.id]), None
+            ),
+            "employer_dashboard": (poster, "get", reverse("employer_dashboard"), None),
+            "create_job": (poster, "get", reverse("create_job"), None),
+            "edit_job": (poster, "get", reverse("edit_job", args=[job.id]), None),
+            "delete_job": (poster, "get", reverse("delete_job", args=[job.id]), None),
+            "view_applicants": (poster, "get", reverse("view_applicants", args=[job.id]), None),
+            "export_applicants": (
+                poster, "get", reverse("export_applicants", args=[job.id]), None
+            ),
+            "bulk_update_applications": (
+                poster,
+                "post",
+                reverse("bulk_update_applications", args=[job.id]),
+                {"applications": [application.id], "status": "Interview"},
+            ),
+            "view_applicant_profile": (
+                poster,
+                "get",
+                reverse("view_applicant_profile", args=[self.applicant_profile.id]),
+                None,
+            ),
+            "update_application_status": (
+                poster, "get", reverse("update_application_status", args=[application.id]), None
+            ),
+            "provide_feedback": (
+                poster, "get", reverse("provide_feedback", args=[application.id]), None
+            ),
+            "application_document": (
+                poster, "get", reverse("application_document", args=[application.id, "cv_file"]), None
+            ),
+            "profile_cv": (
+                poster, "get", reverse("profile_cv", args=[self.applicant_profile.id]), None
+            ),
+            "profile_image_upload": (applicant, "get", reverse("profile_image_upload"), None),
+            "profile_image_status": (applicant, "get", reverse("profile_image_status"), None),
+            "profile_image_remove": (applicant, "get", reverse("profile_image_remove"), None),
+            "cv_upload": (applicant, "get", reverse("cv_upload"), None),
+            "upload_create": (
+                applicant, "post", reverse("upload_create"), {"filename": "cv.pdf", "size": 10}
+            ),
+            "upload_chunk": (
+                applicant, "get", reverse("upload_chunk", args=[self.upload.pk]), None
+            ),
+        }
+
+    def measure(self, user, method, path, data):
+        queries, latencies, render_times = [], [], []
+        for _ in range(REPEAT):
+            client = Client()
+            if user is not None:
+                client.force_login(user)
+            with CaptureQueriesContext(connection) as captured, RenderTimer() as renderer:
+                start = time.perf_counter()
+                response = getattr(client, method)(path, data)
+                if getattr(response, "is_async", False):
+                    async_to_sync(read_async_stream)(response)
+                elif getattr(response, "streaming", False):
+                    b"".join(response.streaming_content)
+                latencies.append(time.perf_counter() - start)
+            self.assertLess(response.status_code, 400, path)
+            queries.append(len(captured))
+            render_times.append(renderer.seconds)
+        return {
+            # The first request may warm per-process caches.
+            "queries": max(queries[1:]),
+            "p50_ms": percentile(latencies, 0.5) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "render_ms": statistics.median(render_times) * 1000,
+        }
+
+    def test_every_url_is_benchmarked(self):
+        names = {pattern.name for pattern in urlpatterns}
+        self.assertEqual(names, set(self.scenarios()))
+
+    def test_query_counts(self):
+        by_size = {}
+        for size in SIZES:
+            self.grow(size)
+            by_size[size] = {
+                name: self.measure(*scenario) for name, scenario in self.scenarios().items()
+            }
+        self.results.update(by_size)
+
+        small, large = by_size[SIZES[0]], by_size[SIZES[-1]]
+        for name in small:
+            with self.subTest(view=name):
+                self.assertEqual(
+                    small[name]["queries"],
+                    large[name]["queries"],
+                    f"{name} runs more queries with more data",
+                )
+
+        counts = {name: large[name]["queries"] for name in sorted(large)}
+        if os.environ.get("UPDATE_QUERY_BASELINE"):
+            BASELINE_PATH.write_text(json.dumps(counts, indent=2) + "\n")
+            return
+        baseline = json.loads(BASELINE_PATH.read_text())
+        for name, count in counts.items():
+            with self.subTest(view=name):
+                self.assertIn(name, baseline, f"{name} has no baseline")
+                self.assertLessEqual(count, baseline[name], f"{name} exceeds its query baseline")
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if not (os.environ.get("BENCHMARK_REPORT") and cls.results):
+            return
+        print(f"\n{'view':<28}{'size':>6}{'queries':>9}{'p50 ms':>9}{'p95 ms':>9}{'render ms':>11}")
+        for size, views in cls.results.items():
+            for name, row in sorted(views.items()):
+                print(
+                    f"{name:<28}{size:>6}{row['queries']:>9}{row['p50_ms']:>9.1f}"
+                    f"{row['p95_ms']:>9.1f}{row['render_ms']:>11.1f}"
+                )
+
+
+class AnonymousPageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = CompanyInfo.objects.create(
+            name="Innovate Inc.",
+            description="Cached company",
+            email="contact@example.com",
+            phone="123",
+            address="1 Test Street",
+            logo="company/logo.svg",
+        )
+        poster = User.objects.create_user("cache-poster")
+        cls.job = create_job(poster, title="Cached Engineer")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_hits_skip_the_database(self):
+        for path in (reverse("home"), reverse("job_detail", args=[self.job.id])):
+            self.client.get(path)
+            with self.assertNumQueries(0):
+                response = self.client.get(path)
+            self.assertContains(response, "Cached Engineer")
+
+    def test_job_changes_invalidate(self):
+        detail = reverse("job_detail", args=[self.job.id])
+        self.client.get(reverse("home"))
+        self.client.get(detail)
+        self.job.title = "Renamed Engineer"
+        self.job.save()
+        self.assertContains(self.client.get(reverse("home")), "Renamed Engineer")
+        self.assertContains(self.client.get(detail), "Renamed Engineer")
+
+    def test_company_changes_invalidate(self):
+        self.client.get(reverse("home"))
+        self.company.name = "Renamed Inc."
+        self.company.save()
+        self.assertContains(self.client.get(reverse("home")), "Renamed Inc.")
+
+    def test_authenticated_pages_are_not_cached(self):
+        self.client.get(reverse("home"))
+        self.client.force_login(self.job.posted_by)
+        with self.assertNumQueries(3):
+            self.client.get(reverse("home"))
+
+
+class AsyncReadViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.poster = User.objects.create_user("async-poster")
+        Profile.objects.create(user=cls.poster, role="POSTER")
+        cls.applicant = User.objects.create_user("async-applicant")
+        Profile.objects.create(user=cls.applicant, role="APPLICANT")
+        cls.job = create_job(cls.poster, title="Async Engineer")
+        Notification.objects.create(recipient=cls.applicant, message="Hello")
+
+    async def test_views_run_on_the_asgi_handler(self):
+        for user, name, args in (
+            (None, "home", []),
+            (None, "job_list", []),
+            (None, "job_detail", [self.job.id]),
+            (self.applicant, "applicant_dashboard", []),
+            (self.applicant, "notifications", []),
+            (self.poster, "employer_dashboard", []),
+        ):
+            with self.subTest(view=name):
+                if user is not None:
+                    await self.async_client.aforce_login(user)
+                response = await self.async_client.get(reverse(name, args=args))
+                self.assertEqual(response.status_code, 200)
+
+    async def test_notifications_lists_unread(self):
+        await self.async_client.aforce_login(self.applicant)
+        response = await self.async_client.get(reverse("notifications"))
+        self.assertEqual(response.json()["unread_count"], 1)
+        self.assertEqual(response.json()["notifications"][0]["message"], "Hello")
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def route(self, model):
+        return read_only_view(lambda request: self.router.db_for_read(model))(None)
+
+    def with_replica(self):
+        return mock.patch.dict(connections.settings, {REPLICA: connections.settings["default"]})
+
+    def test_read_only_views_read_app_models_from_the_replica(self):
+        with self.with_replica():
+            self.assertEqual(self.route(JobPosition), REPLICA)
+            # Users and sessions always come from the primary.
+            self.assertIsNone(self.route(User))
+            self.assertIsNone(self.router.db_for_read(JobPosition))
+
+    async def test_async_read_only_views_use_the_replica(self):
+        @read_only_view
+        async def view(request):
+            return self.router.db_for_read(JobPosition)
+
+        with self.with_replica():
+            self.assertEqual(await view(None), REPLICA)
+            self.assertIsNone(self.router.db_for_read(JobPosition))
+
+    def test_without_a_replica_everything_uses_the_primary(self):
+        self.assertNotIn(REPLICA, connections.settings)
+        self.assertIsNone(self.route(JobPosition))
+
+    def test_writes_and_migrations_go_to_the_primary(self):
+        with self.with_replica():
+            self.assertEqual(read_only_view(
+                lambda request: self.router.db_for_write(JobPosition)
+            )(None), "default")
+        self.assertTrue(self.router.allow_migrate("default", "jobs"))
+        self.assertFalse(self.router.allow_migrate(REPLICA, "jobs"))
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        poster = User.objects.create_user("keyset-poster")
+        cls.jobs = [create_job(poster, title=f"Keyset {i}") for i in range(7)]
+        # Five jobs share one timestamp, so pages must break ties on id.
+        tied_at = timezone.now() - datetime.timedelta(days=1)
+        JobPosition.objects.filter(pk__in=[job.pk for job in cls.jobs[1:6]]).update(created_at=tied_at)
+        JobPosition.objects.filter(pk=cls.jobs[6].pk).update(
+            created_at=tied_at - datetime.timedelta(days=1)
+        )
+
+    def test_cursors_round_trip(self):
+        created_at = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(created_at, 42)), (created_at, 42))
+
+    def test_tampered_cursors_are_bad_requests(self):
+        encoded = lambda raw: base64.urlsafe_b64encode(raw).decode()
+        for cursor in (
+            "not a cursor!",
+            encoded(b"2024-01-01T00:00:00"),
+            encoded(b"yesterday|1"),
+            encoded(b"2024-01-01T00:00:00|one"),
+            encoded(b"2024-01-01T00:00:00|1|2"),
+            encoded(b"\xff\xfe|1"),
+        ):
+            with self.subTest(cursor=cursor), self.assertRaises(BadRequest):
+                decode_cursor(cursor)
+
+    def test_page_size_is_clamped(self):
+        for value, expected in (
+            (None, DEFAULT_PAGE_SIZE),
+            ("many", DEFAULT_PAGE_SIZE),
+            ("0", 1),
+            ("-3", 1),
+            ("30", 30),
+            (str(MAX_PAGE_SIZE + 1), MAX_PAGE_SIZE),
+        ):
+            with self.subTest(value=value):
+                self.assertEqual(get_page_size(value), expected)
+
+    def test_pages_cover_ties_on_created_at_once(self):
+        queryset = JobPosition.objects.all()
+        expected = list(queryset.order_by("-created_at", "-id"))
+        seen, cursor = [], None
+        while True:
+            page = paginate_keyset(queryset, cursor, page_size=2)
+            self.assertLessEqual(len(page), 2)
+            seen.extend(page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), len(self.jobs))
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("paginator-admin")
+        job = create_job(cls.admin)
+        for i in range(4):
+            create_application(job, User.objects.create_user(f"paginator-applicant-{i}"))
+
+    def setUp(self):
+        self.pending = JobApplication.objects.filter(status="Pending").order_by("-id")
+
+    def test_table_estimate_ignores_partial_indexes(self):
+        table = JobApplication._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            # As ANALYZE records them after one of the 4 is withdrawn, with the
+            # partial index (active applications only) listed first.
+            cursor.execute("DELETE FROM sqlite_stat1 WHERE tbl = %s", [table])
+            cursor.executemany(
+                "INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (%s, %s, %s)",
+                [
+                    (table, "jobs_app_applicant_active_idx", "3 1 1"),
+                    (table, "jobs_app_submitted_idx", "4 1"),
+                ],
+            )
+        self.assertEqual(estimated_count(JobApplication), 4)
+
+    def test_small_filtered_listings_are_counted_exactly(self):
+        paginator = EstimatedCountPaginator(self.pending, 2)
+        self.assertEqual(paginator.count, 4)
+
+    @mock.patch("jobs.pagination.ESTIMATE_THRESHOLD", 2)
+    def test_large_filtered_listings_stop_counting_at_the_threshold(self):
+        paginator = EstimatedCountPaginator(self.pending, 2)
+        with CaptureQueriesContext(connection) as queries:
+            # SQLite plans carry no row estimates, so the capped count stands.
+            self.assertEqual(paginator.count, 3)
+        self.assertIn("LIMIT 3", queries[0]["sql"])
+        self.assertTrue(paginator.is_estimate)
+
+    @mock.patch("jobs.pagination.ESTIMATE_THRESHOLD", 2)
+    @mock.patch.object(JobApplicationAdmin, "list_per_page", 1)
+    def test_filtered_admin_changelist_reaches_every_page(self):
+        self.client.force_login(self.admin)
+        url = reverse("admin:jobs_jobapplication_changelist")
+        response = self.client.get(url, {"status__exact": "Pending"})
+        self.assertEqual(response.context["cl"].result_count, 3)
+        self.assertContains(response, "About 3 job applications")
+        # Counting restarts from the page asked for, so the last one opens
+        # and is counted exactly.
+        response = self.client.get(url, {"status__exact": "Pending", "p": 4})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["cl"].paginator.num_pages, 4)
+        self.assertEqual(len(response.context["cl"].result_list), 1)
+        self.assertNotContains(response, "About")
+        self.assertContains(response, "submitted_at__year=")
+
+
+class ResumableUploadTests(TestCase):
+    CONTENT = b"%PDF resumable upload body " * 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("upload-user")
+        cls.profile = Profile.objects.create(user=cls.user, role="APPLICANT")
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(
+            MEDIA_ROOT=media.name, UPLOAD_PARTIAL_DIR=os.path.join(media.name, "partial")
+        ))
+        self.client.force_login(self.user)
+
+    def create(self, size=None):
+        response = self.client.post(
+            reverse("upload_create"),
+            {"filename": "cv.pdf", "size": len(self.CONTENT) if size is None else size},
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def put(self, upload, offset, body):
+        return self.client.put(
+            upload["upload_url"], body, content_type="application/octet-stream",
+            headers={"Upload-Offset": str(offset)},
+        )
+
+    def upload(self):
+        upload = self.create()
+        self.assertEqual(self.put(upload, 0, self.CONTENT).json()["complete"], True)
+        return UploadSession.objects.select_related("stored_file").get(pk=upload["upload_id"])
+
+    def test_chunks_resume_from_the_reported_offset(self):
+        upload = self.create()
+        self.put(upload, 0, self.CONTENT[:100])
+        # A chunk sent for the wrong offset is refused with the real one.
+        response = self.put(upload, 50, self.CONTENT[50:])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["offset"], 100)
+        self.assertEqual(self.client.get(upload["upload_url"]).json()["offset"], 100)
+        # Another process has no running hash and rebuilds it from the file.
+        uploads._hashers.clear()
+        response = self.put(upload, 100, self.CONTENT[100:])
+        self.assertTrue(response.json()["complete"])
+        stored = StoredFile.objects.get()
+        self.assertEqual(stored.digest, hashlib.sha256(self.CONTENT).hexdigest())
+        self.assertEqual(stored.file.read(), self.CONTENT)
+        self.assertFalse(os.path.exists(partial_path(UploadSession.objects.get())))
+
+    def test_rejects_bad_sessions(self):
+        self.assertEqual(
+            self.client.post(reverse("upload_create"), {"filename": "cv.exe", "size": 10}).status_code,
+            400,
+        )
+        self.assertEqual(
+            self.client.post(
+                reverse("upload_create"), {"filename": "cv.pdf", "size": MAX_CV_SIZE + 1}
+            ).status_code,
+            400,
+        )
+        upload = self.create()
+        self.client.force_login(User.objects.create_user("upload-other"))
+        self.assertEqual(self.client.get(upload["upload_url"]).status_code, 404)
+
+    def test_identical_content_is_stored_once(self):
+        first, second = self.upload(), self.upload()
+        self.assertEqual(first.stored_file, second.stored_file)
+        stored = StoredFile.objects.get()
+        self.assertEqual(stored.ref_count, 2)
+        self.assertEqual(len(os.listdir(os.path.dirname(stored.file.path))), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse("upload_chunk", args=[first.pk]))
+        stored.refresh_from_db()
+        self.assertEqual(stored.ref_count, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse("upload_chunk", args=[second.pk]))
+        self.assertFalse(StoredFile.objects.exists())
+        self.assertFalse(default_storage.exists(stored.file.name))
+
+    def test_completed_upload_becomes_the_profile_cv(self):
+        session = self.upload()
+        response = self.client.post(reverse("cv_upload"), {"upload_id": str(session.pk)})
+        self.assertTrue(response.json()["success"])
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.cv.name, session.stored_file.file.name)
+        self.assertFalse(UploadSession.objects.exists())
+        # The reference passed from the session to the profile.
+        self.assertEqual(StoredFile.objects.get().ref_count, 1)
+
+
+class ApplyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        poster = User.objects.create_user("apply-poster")
+        cls.applicant = User.objects.create_user("apply-applicant")
+        Profile.objects.create(user=cls.applicant, role="APPLICANT")
+        cls.job = create_job(poster, title="Apply Engineer")
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+
+    def submit(self, content=b"Apply CV"):
+        return self.client.post(
+            reverse("apply_for_job", args=[self.job.id]),
+            {
+                "full_name": "Apply Applicant",
+                "email": "apply@example.com",
+                "phone_number": "555",
+                "skills": "Python",
+                "work_experience": "1 year",
+                "education": "B.Sc.",
+                "cv_file": SimpleUploadedFile("cv.doc", content, "application/msword"),
+            },
+        )
+
+    def test_duplicate_submission_is_rejected_by_the_insert(self):
+        self.client.force_login(self.applicant)
+        self.assertRedirects(self.submit(), reverse("applicant_dashboard"))
+        self.assertRedirects(self.submit(), reverse("job_list"), fetch_redirect_response=False)
+        self.assertEqual(JobApplication.objects.filter(job=self.job).count(), 1)
+        self.assertEqual(StoredFile.objects.get().ref_count, 1)
+
+    def test_rejected_submission_keeps_no_new_file(self):
+        self.client.force_login(self.applicant)
+        self.submit()
+        stored = StoredFile.objects.get()
+        self.submit(b"A different CV")
+        self.assertEqual(list(StoredFile.objects.all()), [stored])
+        digest = hashlib.sha256(b"A different CV").hexdigest()
+        self.assertFalse(default_storage.exists(content_name(digest, "cv.doc")))
+
+    def test_rejected_submission_keeps_its_upload_session(self):
+        self.client.force_login(self.applicant)
+        self.submit()
+        stored = StoredFile.objects.get()
+        session = UploadSession.objects.create(
+            user=self.applicant, filename="cv.doc", size=stored.size, offset=stored.size,
+            stored_file=stored,
+        )
+        StoredFile.objects.filter(pk=stored.pk).update(ref_count=2)
+        response = self.client.post(
+            reverse("apply_for_job", args=[self.job.id]),
+            {
+                "full_name": "Apply Applicant",
+                "email": "apply@example.com",
+                "phone_number": "555",
+                "skills": "Python",
+                "work_experience": "1 year",
+                "education": "B.Sc.",
+                "cv_upload": str(session.pk),
+            },
+        )
+        self.assertRedirects(response, reverse("job_list"), fetch_redirect_response=False)
+        self.assertTrue(UploadSession.objects.filter(pk=session.pk).exists())
+        self.assertEqual(StoredFile.objects.get().ref_count, 2)
+
+    def test_expired_jobs_do_not_take_applications(self):
+        JobPosition.objects.filter(pk=self.job.pk).update(application_deadline="2000-01-01")
+        self.client.force_login(self.applicant)
+        self.assertRedirects(self.submit(), reverse("job_list"), fetch_redirect_response=False)
+        self.assertFalse(JobApplication.objects.exists())
+
+
+class BulkUpdateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.poster = User.objects.create_user("bulk-poster")
+        Profile.objects.create(user=cls.poster, role="POSTER")
+        cls.other_poster = User.objects.create_user("bulk-other-poster")
+        Profile.objects.create(user=cls.other_poster, role="POSTER")
+        applicant = User.objects.create_user("bulk-applicant")
+        Profile.objects.create(user=applicant, role="APPLICANT")
+        cls.job = create_job(cls.poster, title="Bulk Engineer")
+        cls.other_job = create_job(cls.other_poster, title="Other Engineer")
+        cls.application = create_application(cls.job, applicant)
+        cls.other_application = create_application(cls.other_job, applicant)
+
+    def bulk_update(self, job, *applications):
+        return self.client.post(
+            reverse("bulk_update_applications", args=[job.id]),
+            {"applications": [application.id for application in applications], "status": "Interview"},
+        )
+
+    def test_updates_selected_applications(self):
+        self.client.force_login(self.poster)
+        response = self.bulk_update(self.job, self.application)
+        self.assertRedirects(response, reverse("view_applicants", args=[self.job.id]))
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, "Interview")
+        self.assertEqual(Notification.objects.filter(recipient=self.application.applicant).count(), 1)
+
+    def test_other_posters_jobs_are_not_found(self):
+        self.client.force_login(self.poster)
+        self.assertEqual(self.bulk_update(self.other_job, self.other_application).status_code, 404)
+        self.other_application.refresh_from_db()
+        self.assertEqual(self.other_application.status, "Pending")
+
+    def test_applications_to_other_jobs_are_rejected(self):
+        self.client.force_login(self.poster)
+        response = self.bulk_update(self.job, self.application, self.other_application)
+        self.assertRedirects(response, reverse("view_applicants", args=[self.job.id]))
+        statuses = JobApplication.objects.values_list("status", flat=True)
+        self.assertEqual(set(statuses), {"Pending"})
+        self.assertFalse(Notification.objects.exists())
+
+    def test_applicants_page_offers_every_status(self):
+        self.client.force_login(self.poster)
+        response = self.client.get(reverse("view_applicants", args=[self.job.id]))
+        for value, label in JobApplication.STATUS_CHOICES:
+            self.assertContains(response, f'<option value="{value}">{label}</option>', html=True)
+        self.assertContains(response, '<label for="bulk-status">With selected:</label>', html=True)
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.poster = User.objects.create_user("export-poster")
+        Profile.objects.create(user=cls.poster, role="POSTER")
+        cls.other_poster = User.objects.create_user("export-other-poster")
+        Profile.objects.create(user=cls.other_poster, role="POSTER")
+        cls.applicant = User.objects.create_user("export-applicant")
+        Profile.objects.create(user=cls.applicant, role="APPLICANT")
+        cls.job = create_job(cls.poster, title="Export Engineer")
+        create_application(
+            cls.job, cls.applicant, full_name="=HYPERLINK(\"http://example.com\")", skills="-1+2"
+        )
+        cls.second_applicant = User.objects.create_user("export-applicant-2")
+        create_application(cls.job, cls.second_applicant, full_name="Second Applicant")
+
+    async def export(self, export_format, user=None):
+        await self.async_client.aforce_login(user or self.poster)
+        return await self.async_client.get(
+            reverse("export_applicants", args=[self.job.id]), {"format": export_format}
+        )
+
+    async def content(self, response):
+        self.assertTrue(response.is_async)
+        return (await read_async_stream(response)).decode()
+
+    async def test_csv_is_streamed_with_formulas_neutralised(self):
+        response = await self.export("csv")
+        self.assertEqual(
+            response["Content-Disposition"], f'attachment; filename="job-{self.job.id}-applicants.csv"'
+        )
+        row, _ = csv.DictReader(io.StringIO(await self.content(response)))
+        self.assertEqual(row["full_name"], "'=HYPERLINK(\"http://example.com\")")
+        self.assertEqual(row["skills"], "'-1+2")
+        self.assertEqual(row["email"], "applicant@example.com")
+
+    async def test_jsonl_keeps_values_as_entered(self):
+        line, _ = (await self.content(await self.export("jsonl"))).splitlines()
+        self.assertEqual(json.loads(line)["full_name"], "=HYPERLINK(\"http://example.com\")")
+
+    @mock.patch("jobs.exports.EXPORT_CHUNK_SIZE", 1)
+    async def test_rows_are_sent_as_they_are_fetched(self):
+        response = await self.export("csv")
+        chunks = [chunk async for chunk in response.streaming_content]
+        # The header, then one chunk per fetched batch of rows.
+        self.assertEqual(len(chunks), 3)
+
+    async def test_only_the_jobs_poster_can_export(self):
+        self.assertEqual((await self.export("csv", self.other_poster)).status_code, 404)
+        self.assertEqual((await self.export("csv", self.applicant)).status_code, 302)
+
+    async def test_unknown_formats_are_not_found(self):
+        self.assertEqual((await self.export("xml")).status_code, 404)
+
+
+class MatchingTests(TestCase):
+    def test_scores_share_of_required_skills(self):
+        scores = score_skills(
+            "Python, Django;  Machine   Learning/SQL",
+            [
+                ("python, machine learning", "SQL, Python"),
+                ("Go", None),
+                ("", "django"),
+                (),
+            ],
+        )
+        self.assertEqual(scores.tolist(), [0.75, 0.0, 0.25, 0.0])
+
+    def test_jobs_without_skills_score_zero(self):
+        self.assertEqual(score_skills("", [("Python",)]).tolist(), [0.0])
+
+    def test_applicants_can_be_ranked_by_match(self):
+        poster = User.objects.create_user("match-poster")
+        Profile.objects.create(user=poster, role="POSTER")
+        job = create_job(poster, required_skills="Python, Django, SQL")
+        submitted_at = timezone.now()
+        for minutes, (name, skills, profile_skills) in enumerate((
+            ("partial", "Python", "SQL"),
+            ("none", "Go", ""),
+            ("full", "Python, Django", "SQL"),
+            ("also-partial", "django", "sql"),
+        )):
+            user = User.objects.create_user(f"match-{name}")
+            Profile.objects.create(user=user, role="APPLICANT", skills=profile_skills)
+            application = create_application(job, user, full_name=name, skills=skills)
+            JobApplication.objects.filter(pk=application.pk).update(
+                submitted_at=submitted_at + datetime.timedelta(minutes=minutes)
+            )
+        self.client.force_login(poster)
+        response = self.client.get(reverse("view_applicants", args=[job.id]), {"sort": "match"})
+        ranked = [(a.full_name, round(a.match_score, 2)) for a in response.context["applications"]]
+        # Equal scores keep the newest-first order.
+        self.assertEqual(
+            ranked,
+            [("full", 1.0), ("also-partial", 0.67), ("partial", 0.67), ("none", 0.0)],
+        )
+
+
+class CVTextTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+
+    @staticmethod
+    def pdf(text):
+        """
+        Returns a one-page PDF showing `text`.
+        """
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+            b"/Resources << /Font << /F1 5 0 R >> >> >>",
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        ]
+        out = io.BytesIO()
+        out.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(out.tell())
+            out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+        xref = out.tell()
+        out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        out.writelines(b"%010d 00000 n \n" % offset for offset in offsets)
+        out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            len(objects) + 1, xref,
+        ))
+        return out.getvalue()
+
+    @staticmethod
+    def docx(*paragraphs):
+        body = "".join(
+            f'<w:p><w:r><w:t>{paragraph}</w:t></w:r></w:p>' for paragraph in paragraphs
+        )
+        out = io.BytesIO()
+        with zipfile.ZipFile(out, "w") as archive:
+            archive.writestr(
+                "word/document.xml",
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f"<w:body>{body}</w:body></w:document>",
+            )
+        return out.getvalue()
+
+    def store(self, name, content):
+        return default_storage.save(name, ContentFile(content))
+
+    def test_extracts_each_supported_format(self):
+        for name, content in (
+            ("cvs/cv.pdf", self.pdf("Kubernetes operator experience")),
+            ("cvs/cv.docx", self.docx("Kubernetes operator", "  experience ")),
+            ("cvs/cv.doc", b"\x00\x01" + "Kubernetes operator experience".encode("utf-16-le")),
+            ("cvs/cv-ansi.doc", b"\x00\x01Kubernetes operator experience\x00"),
+        ):
+            with self.subTest(name=name):
+                self.assertEqual(
+                    extract_text(self.store(name, content)), "Kubernetes operator experience"
+                )
+
+    def test_unreadable_files_are_recorded_with_their_error(self):
+        for name, content, error in (
+            ("cvs/cv.txt", b"Plain text", "Unsupported file type"),
+            ("cvs/broken.docx", b"not a zip", "Unreadable DOCX"),
+            ("cvs/broken.pdf", b"not a pdf", "Unreadable PDF"),
+        ):
+            with self.subTest(name=name):
+                name = self.store(name, content)
+                index_cv(name)
+                document = CVDocument.objects.get(file_name=name)
+                self.assertEqual(document.text, "")
+                self.assertIn(error, document.error)
+        index_cv("cvs/missing.pdf")
+        self.assertTrue(CVDocument.objects.get(file_name="cvs/missing.pdf").error)
+
+    def test_each_cv_is_extracted_once(self):
+        name = self.store("cvs/cv.docx", self.docx("Kubernetes"))
+        self.assertEqual(pending_cv_names(), [])
+        poster = User.objects.create_user("cv-poster")
+        applicant = User.objects.create_user("cv-applicant")
+        create_application(create_job(poster), applicant, cv_file=name)
+        self.assertEqual(pending_cv_names(), [name])
+        index_cv(name)
+        self.assertEqual(pending_cv_names(), [])
+        with mock.patch("jobs.cv_text.extract_result") as extract:
+            index_cv(name)
+        extract.assert_not_called()
+
+    def test_full_text_index_follows_the_documents(self):
+        document = CVDocument.objects.create(file_name="cvs/a.pdf", text="Kubernetes and Terraform")
+        CVDocument.objects.create(file_name="cvs/b.pdf", text="Frontend React developer")
+        matches = lambda text: list(
+            filter_cv_matching(CVDocument.objects.all(), text).values_list("file_name", flat=True)
+        )
+        self.assertEqual(matches("kubernetes terraform"), ["cvs/a.pdf"])
+        self.assertEqual(matches("kubernetes react"), [])
+        self.assertEqual(matches("!!!"), [])
+        document.text = "Rust embedded engineer"
+        document.save()
+        self.assertEqual(matches("kubernetes"), [])
+        self.assertEqual(matches("rust"), ["cvs/a.pdf"])
+        document.delete()
+        self.assertEqual(matches("rust"), [])
+
+    def test_applicants_can_be_filtered_by_cv_text(self):
+        poster = User.objects.create_user("cv-search-poster")
+        Profile.objects.create(user=poster, role="POSTER")
+        job = create_job(poster)
+        for name, text in (("kube", "Kubernetes operator"), ("react", "React developer")):
+            applicant = User.objects.create_user(f"cv-search-{name}")
+            Profile.objects.create(user=applicant, role="APPLICANT")
+            create_application(job, applicant, full_name=name, cv_file=f"cvs/{name}.pdf")
+            CVDocument.objects.create(file_name=f"cvs/{name}.pdf", text=text)
+        self.client.force_login(poster)
+        response = self.client.get(reverse("view_applicants", args=[job.id]), {"cv_q": "kubernetes"})
+        self.assertEqual([a.full_name for a in response.context["applications"]], ["kube"])
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.poster = User.objects.create_user("search-poster")
+        cls.title_hit = create_job(
+            cls.poster, title="Kubernetes Engineer", required_skills="Kubernetes, Go"
+        )
+        cls.description_hit = create_job(
+            cls.poster,
+            title="Platform Engineer",
+            description="Some exposure to Kubernetes is a plus.",
+            location="Berlin",
+        )
+        cls.miss = create_job(cls.poster, title="Frontend Developer", job_type="Part-time")
+
+    def search(self, text):
+        return list(rank_matching(JobPosition.objects.all(), text))
+
+    def test_ranks_title_matches_first(self):
+        self.assertEqual(self.search("kubernetes"), [self.title_hit, self.description_hit])
+        self.assertEqual(self.search("kubernetes berlin"), [])
+        self.assertEqual(self.search("!!!"), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.miss.title = "Kubernetes Frontend Developer"
+        self.miss.save()
+        self.assertIn(self.miss, self.search("kubernetes"))
+        self.assertEqual(self.search("frontend"), [self.miss])
+        self.title_hit.delete()
+        self.assertNotIn(self.title_hit.title, [job.title for job in self.search("kubernetes")])
+
+    def test_facets_count_each_value(self):
+        self.assertEqual(
+            facet_counts(JobPosition.objects.all(), "job_type"),
+            [("Full-time", 2), ("Part-time", 1)],
+        )
+        matching = filter_matching(JobPosition.objects.all(), "engineer")
+        self.assertEqual(facet_counts(matching, "location"), [("Berlin", 1), ("Remote", 1)])
+
+    def test_other_backends_fall_back_to_substring_matching(self):
+        with mock.patch.object(connection, "vendor", "mysql"):
+            self.assertEqual(
+                list(rank_matching(JobPosition.objects.all(), "kubernetes ENGINEER")),
+                [self.description_hit, self.title_hit],
+            )
+
+    def test_ranked_pages_seek_past_ties(self):
+        ties = [create_job(self.poster, title="Tied Analyst") for _ in range(5)]
+        results = rank_matching(JobPosition.objects.all(), "analyst")
+        seen, cursor = [], None
+        while True:
+            with self.assertNumQueries(1):
+                page = paginate_ranked(results, cursor=cursor, page_size=2)
+            seen.extend(page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, sorted(ties, key=lambda job: -job.pk))
+
+    def test_search_pages_through_the_view(self):
+        for _ in range(3):
+            create_job(self.poster, title="Kubernetes Operator")
+        response = self.client.get(reverse("job_list"), {"q": "kubernetes", "per_page": 2})
+        self.assertEqual(len(response.context["jobs"]), 2)
+        cursor = response.context["jobs"].next_cursor
+        response = self.client.get(
+            reverse("job_list"), {"q": "kubernetes", "per_page": 2, "cursor": cursor}
+        )
+        self.assertEqual(len(response.context["jobs"]), 2)
+        self.assertEqual(
+            self.client.get(reverse("job_list"), {"q": "kubernetes", "cursor": "bad!"}).status_code,
+            400,
+        )
+
+
+    def test_picking_a_facet_starts_from_the_first_page(self):
+        for _ in range(3):
+            create_job(self.poster, title="Kubernetes Operator", location="Berlin")
+        params = {"q": "kubernetes", "per_page": 2}
+        first = self.client.get(reverse("job_list"), params)
+        later = self.client.get(
+            reverse("job_list"), {**params, "cursor": first.context["jobs"].next_cursor}
+        )
+        (link,) = re.findall(r'href="\?([^"]*location=Berlin[^"]*)"', later.content.decode())
+        link = html.unescape(link)
+        self.assertNotIn("cursor", link)
+        response = self.client.get(f"{reverse('job_list')}?{link}")
+        self.assertEqual(len(response.context["jobs"]), 2)
+        berlin = rank_matching(JobPosition.objects.filter(location="Berlin"), "kubernetes")
+        self.assertEqual(list(response.context["jobs"]), list(berlin[:2]))
+
+
+class DeadlineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.poster = User.objects.create_user("deadline-poster")
+        cls.expired = [cls.create_job(f"Expired {i}", "2000-01-01") for i in range(3)]
+        cls.due_today = cls.create_job("Due today", "2030-06-01")
+        cls.closed = cls.create_job("Already closed", "2000-01-01", status="Closed")
+
+    @classmethod
+    def create_job(cls, title, deadline, status="Open"):
+        return create_job(cls.poster, title=title, application_deadline=deadline, status=status)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_closes_expired_jobs_in_batches(self):
+        today = datetime.date(2030, 6, 1)
+        # A savepoint, SELECT, UPDATE and release per batch of two.
+        with self.assertNumQueries(2 * 4):
+            self.assertEqual(close_expired_jobs(today=today, batch_size=2), 3)
+        self.assertEqual(
+            set(JobPosition.objects.filter(status="Open").values_list("title", flat=True)),
+            {"Due today"},
+        )
+        with self.assertNumQueries(3):
+            self.assertEqual(close_expired_jobs(today=today), 0)
+
+    def test_cached_listings_are_invalidated(self):
+        self.assertContains(self.client.get(reverse("home")), "Expired 0")
+        close_expired_jobs(today=datetime.date(2030, 6, 1))
+        self.assertNotContains(self.client.get(reverse("home")), "Expired 0")
+
+
+class ApplicantDashboardTests(TestCase):
+    def test_missing_profile_picture_falls_back_to_default(self):
+        user = User.objects.create_user("no-picture")
+        Profile.objects.create(user=user, role="APPLICANT", profile_picture="")
+        self.client.force_login(user)
+        response = self.client.get(reverse("applicant_dashboard"))
+        self.assertContains(response, "images/default-profile.svg")
+
+    def test_sessions_from_the_default_backend_stay_logged_in(self):
+        user = User.objects.create_user("old-session")
+        Profile.objects.create(user=user, role="APPLICANT")
+        self.client.force_login(user, backend="django.contrib.auth.backends.ModelBackend")
+        response = self.client.get(reverse("applicant_dashboard"))
+        self.assertEqual(response.status_code, 200)
+
+
+class SyntheticDataTests(TestCase):
+    def generate(self):
+        plan = Plan(
+            users=10, jobs=4, applications=20, notifications=10, seed=7, batch_size=4,
+            now=datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc),
+        )
+        generate(plan)
+        return [
+            list(model.objects.order_by("pk").values_list())
+            for model in (User, Profile, JobPosition, JobApplication, Notification)
+        ]
+
+    def test_same_seed_and_reference_time_give_the_same_rows(self):
+        first = self.generate()
+        User.objects.all().delete()
+        self.assertEqual(self.generate(), first)
+
+
+class ProfilePictureTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.user = User.objects.create_user("picture-user")
+        self.profile = Profile.objects.create(user=self.user, role="APPLICANT", profile_picture="")
+        self.client.force_login(self.user)
+
+    def upload(self, content):
+        # Runs the background task inline instead of on the pool.
+        with mock.patch("jobs.images.enqueue", lambda func, *args: func(*args)):
+            return queue_profile_picture(self.profile, SimpleUploadedFile("me.png", content))
+
+    def status(self):
+        return self.client.get(reverse("profile_image_status")).json()
+
+    def test_processed_picture_replaces_the_old_one(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (40, 20), "red").save(buffer, format="PNG")
+        token = self.upload(buffer.getvalue())
+        status = self.status()
+        self.assertEqual((status["success"], status["pending"]), (True, False))
+        self.assertIn(f"profiles/{self.profile.pk}/{token}-300.png", status["profile_image_url"])
+
+    def test_failure_is_reported(self):
+        with self.assertRaises(UnidentifiedImageError):
+            self.upload(b"not an image")
+        status = self.status()
+        self.assertEqual((status["success"], status["pending"]), (False, False))
+        self.assertEqual(status["error"], PROCESSING_FAILED)
+
+    def test_lost_task_times_out(self):
+        Profile.objects.filter(pk=self.profile.pk).update(
+            picture_task="lost", picture_task_at=timezone.now() - timezone.timedelta(hours=1)
+        )
+        status = self.status()
+        self.assertEqual((status["success"], status["pending"]), (False, False))
+
+
+@override_settings(REQUEST_PROFILING_SAMPLE_RATE=1)
+class ProfilingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        poster = User.objects.create_user("profiling-poster")
+        create_job(poster, title="Profiled Engineer")
+
+    def setUp(self):
+        # job_list is cached; a cached page would run no queries.
+        cache.clear()
+
+    def assertProfiled(self, response, path):
+        self.assertIn("sql;dur=", response["Server-Timing"])
+        summary = recent_profiles()[-1]
+        self.assertEqual(summary["path"], path)
+        self.assertGreater(summary["sql_count"], 0)
+        self.assertGreater(summary["template_ms"], 0)
+        self.assertTrue(all(query["origin"] != "unknown" for query in summary["slow_queries"]))
+
+    def test_profiles_sync_requests(self):
+        response = self.client.get(reverse("job_list"))
+        self.assertProfiled(response, reverse("job_list"))
+
+    async def test_profiles_async_requests(self):
+        response = await self.async_client.get(reverse("job_list"))
+        self.assertProfiled(response, reverse("job_list"))
+
+    @override_settings(REQUEST_PROFILING_SAMPLE_RATE=0.5)
+    def test_unsampled_requests_are_left_alone(self):
+        before = len(recent_profiles())
+        with mock.patch("jobs.profiling.random.random", return_value=0.9):
+            response = self.client.get(reverse("job_list"))
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(len(recent_profiles()), before)
+
+    @override_settings(DEBUG=True)
+    def test_async_chain_is_not_adapted(self):
+        with self.assertLogs("django.request", level="DEBUG") as logs:
+            logging.getLogger("django.request").debug("Building the ASGI handler.")
+            ASGIHandler()
+        self.assertEqual([line for line in logs.output if "adapted" in line], [])
+
+
+class StaticFilesMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.css = b"body { color: red; }" * 50
+        os.makedirs(os.path.join(root.name, "css"))
+        with open(os.path.join(root.name, "css", "site.css"), "wb") as f:
+            f.write(self.css)
+        with open(os.path.join(root.name, "css", "site.css.gz"), "wb") as f:
+            f.write(gzip.compress(self.css))
+        self.root = root.name
+        with override_settings(STATIC_ROOT=root.name, STATIC_URL="/static/"):
+            self.middleware = StaticFilesMiddleware(lambda request: HttpResponse("app"))
+
+    def get(self, path, **headers):
+        return self.middleware(RequestFactory().get(path, **headers))
+
+    def test_serves_the_precompressed_variant(self):
+        response = self.get("/static/css/site.css", HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), self.css)
+
+    def test_serves_identity_without_accept_encoding(self):
+        response = self.get("/static/css/site.css")
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(b"".join(response.streaming_content), self.css)
+
+    def test_other_paths_reach_the_app(self):
+        self.assertEqual(self.get("/static/css/missing.css").content, b"app")
+        self.assertEqual(self.get("/static/css/site.css.gz").content, b"app")
+
+    def test_refused_encodings_are_not_served(self):
+        response = self.get("/static/css/site.css", HTTP_ACCEPT_ENCODING="gzip;q=0, br")
+        self.assertNotIn("Content-Encoding", response)
+        response = self.get("/static/css/site.css", HTTP_ACCEPT_ENCODING="*;q=0.5")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    @override_settings(DEBUG=True)
+    def test_async_chain_is_not_adapted(self):
+        # Django only logs adaptations with DEBUG on.
+        with self.assertLogs("django.request", level="DEBUG") as logs:
+            logging.getLogger("django.request").debug("Building the ASGI handler.")
+            ASGIHandler()
+        self.assertEqual([line for line in logs.output if "adapted" in line], [])
+
+    async def test_async_requests_reach_the_app(self):
+        async def app(request):
+            return HttpResponse("app")
+
+        with override_settings(STATIC_ROOT=self.root, STATIC_URL="/static/"):
+            middleware = StaticFilesMiddleware(app)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = await middleware(RequestFactory().get("/static/css/missing.css"))
+        self.assertEqual(response.content, b"app")
+        response = await middleware(RequestFactory().get("/static/css/site.css"))
+        self.assertEqual(b"".join(response.streaming_content), self.css)
+
+
+class ProtectedDownloadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.poster = User.objects.create_user("download-poster")
+        Profile.objects.create(user=cls.poster, role="POSTER")
+        cls.stranger = User.objects.create_user("download-stranger")
+        Profile.objects.create(user=cls.stranger, role="POSTER")
+        applicant = User.objects.create_user("download-applicant")
+        cls.profile = Profile.objects.create(user=applicant, role="APPLICANT", cv="cvs/dummy_cv.pdf")
+        job = create_job(cls.poster, title="Download Engineer")
+        cls.application = create_application(job, applicant)
+        cls.url = reverse("application_document", args=[cls.application.id, "cv_file"])
+        with open(cls.application.cv_file.path, "rb") as f:
+            cls.content = f.read()
+
+    def test_only_the_job_owner_and_applicant_can_download(self):
+        self.client.force_login(self.stranger)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.assertEqual(
+            self.client.get(reverse("profile_cv", args=[self.profile.id])).status_code, 403
+        )
+        self.client.force_login(self.poster)
+        response = self.client.get(self.url)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(
+            self.client.get(reverse("profile_cv", args=[self.profile.id])).status_code, 200
+        )
+
+    def test_range_and_conditional_requests(self):
+        self.client.force_login(self.poster)
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 0-9/{len(self.content)}")
+        self.assertEqual(b"".join(response.streaming_content), self.content[:10])
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.content)}-")
+        self.assertEqual(response.status_code, 416)
+        # Invalid ranges are ignored, not refused.
+        response = self.client.get(self.url, HTTP_RANGE="bytes=5-3")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+
+    async def test_asgi_downloads_are_streamed_asynchronously(self):
+        await self.async_client.aforce_login(self.poster)
+        response = await self.async_client.get(self.url)
+        self.assertTrue(response.is_async)
+        self.assertEqual(response["Content-Length"], str(len(self.content)))
+        self.assertEqual(await read_async_stream(response), self.content)
+        response = await self.async_client.get(self.url, headers={"Range": "bytes=0-9"})
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response.is_async)
+        self.assertEqual(await read_async_stream(response), self.content[:10])
+
+    @override_settings(DEBUG=True)
+    def test_debug_media_route_skips_protected_folders(self):
+        urls = importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+        self.addCleanup(clear_url_caches)
+        self.addCleanup(importlib.reload, urls)
+        clear_url_caches()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        for name in ("company/logo.svg", "cvs/dummy_cv.pdf", "documents/letter.pdf"):
+            default_storage.save(name, ContentFile(b"media"))
+        self.assertEqual(self.client.get("/media/company/logo.svg").status_code, 200)
+        for path in (
+            "/media/cvs/dummy_cv.pdf",
+            "/media/documents/letter.pdf",
+            "/media//cvs/dummy_cv.pdf",
+            "/media/x/../cvs/dummy_cv.pdf",
+            "/media/./documents/letter.pdf",
+            "/media/CVS/dummy_cv.pdf",
+        ):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 404)
+
+    @override_settings(PROTECTED_MEDIA_SERVER="x-accel-redirect")
+    def test_hands_off_to_the_front_server(self):
+        self.client.force_login(self.poster)
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/cvs/dummy_cv.pdf")
+        self.assertEqual(response.content, b"")
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.poster = User.objects.create_user("archive-poster")
+        Profile.objects.create(user=cls.poster, role="POSTER")
+        cls.applicant = User.objects.create_user("archive-applicant")
+        Profile.objects.create(user=cls.applicant, role="APPLICANT")
+        cls.closed_job = cls.create_job("Closed")
+        cls.open_job = cls.create_job("Open")
+        cls.closed_application = cls.create_application(cls.closed_job, "cvs/sha256/closed.pdf")
+        cls.withdrawn = cls.create_application(cls.open_job, "cvs/sha256/withdrawn.pdf")
+        JobApplication.objects.filter(pk=cls.withdrawn.pk).update(is_active=False)
+        for name in ("closed", "withdrawn"):
+            StoredFile.objects.create(
+                digest=name, file=f"cvs/sha256/{name}.pdf", size=1, ref_count=1
+            )
+
+    @classmethod
+    def create_job(cls, status):
+        return create_job(
+            cls.poster, title=f"{status} Archive Engineer", description="Archive job", status=status
+        )
+
+    @classmethod
+    def create_application(cls, job, cv_file):
+        return create_application(
+            job,
+            cls.applicant,
+            full_name="Archive Applicant",
+            email="archive@example.com",
+            cv_file=cv_file,
+            feedback="Thanks for applying",
+        )
+
+    def test_moves_old_rows_in_batches(self):
+        archive_records(timezone.now() - timezone.timedelta(days=1))
+        self.assertEqual(ArchivedJobPosition.objects.count(), 0)
+
+        self.assertEqual(archive_records(timezone.now(), batch_size=1), (1, 2))
+        self.assertFalse(JobPosition.objects.filter(pk=self.closed_job.pk).exists())
+        self.assertEqual(list(JobApplication.objects.all()), [])
+        self.assertTrue(JobPosition.objects.filter(pk=self.open_job.pk).exists())
+        job = ArchivedJobPosition.objects.get(pk=self.closed_job.pk)
+        self.assertEqual(job.application_count, 1)
+        self.assertEqual(job.record["description"], "Archive job")
+        application = ArchivedJobApplication.objects.get(pk=self.withdrawn.pk)
+        self.assertFalse(application.is_active)
+        self.assertEqual(application.record["feedback"], "Thanks for applying")
+        # The archive keeps the files it references.
+        self.assertEqual(StoredFile.objects.count(), 2)
+
+    def test_history_pages_read_the_archive(self):
+        archive_records(timezone.now())
+        self.client.force_login(self.applicant)
+        response = self.client.get(reverse("applicant_history"))
+        self.assertContains(response, "Closed Archive Engineer")
+        self.assertContains(response, "Thanks for applying")
+        self.client.force_login(self.poster)
+        self.assertContains(
+            self.client.get(reverse("employer_history")), "Closed Archive Engineer"
+        )
+        response = self.client.get(reverse("archived_job", args=[self.closed_job.pk]))
+        self.assertContains(response, "archive@example.com")
+
+    def test_archived_applicants_are_paginated(self):
+        archive_records(timezone.now())
+        ArchivedJobApplication.objects.filter(pk=self.withdrawn.pk).update(
+            job_id=self.closed_job.pk
+        )
+        self.client.force_login(self.poster)
+        url = reverse("archived_job", args=[self.closed_job.pk])
+        with mock.patch("jobs.views.HISTORY_PAGE_SIZE", 1):
+            self.assertContains(self.client.get(url), "Page 1 of 2")
+            self.assertContains(self.client.get(url, {"page": 2}), "Page 2 of 2")
+
+    def test_deleting_the_archive_releases_files(self):
+        archive_records(timezone.now())
+        ArchivedJobApplication.objects.all().delete()
+        self.assertEqual(StoredFile.objects.count(), 0)
+
+
+class DuplicateDetectionTests(TestCase):
+    EXPERIENCE = (
+        "Five years building Django services for a logistics company, "
+        "leading the migration from a monolith to background workers and "
+        "owning the PostgreSQL schema and its performance tuning."
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.poster = User.objects.create_user("duplicate-poster")
+        Profile.objects.create(user=cls.poster, role="POSTER")
+        cls.job = create_job(cls.poster, title="Duplicate Engineer")
+        CVDocument.objects.create(
+            file_name="cvs/same.pdf", text="Jane Doe senior backend engineer " * 20
+        )
+        cls.copies = [
+            cls.create_application(f"copy-{i}", cls.EXPERIENCE, "cvs/same.pdf")
+            for i in range(3)
+        ]
+        cls.other = cls.create_application(
+            "other",
+            "Two years of frontend work in React and TypeScript for an agency.",
+            "cvs/other.pdf",
+        )
+        index_applications(JobApplication.objects.filter(job=cls.job))
+
+    @classmethod
+    def create_application(cls, username, experience, cv_file):
+        user = User.objects.create_user(username)
+        Profile.objects.create(user=user, role="APPLICANT")
+        return create_application(
+            cls.job,
+            user,
+            full_name=username,
+            email=f"{username}@example.com",
+            skills="Python, Django, PostgreSQL",
+            work_experience=experience,
+            cv_file=cv_file,
+        )
+
+    def test_signatures_estimate_jaccard_similarity(self):
+        words = [f"word{i}" for i in range(400)]
+        a = shingles(" ".join(words))
+        b = shingles(" ".join(words[:300] + [f"other{i}" for i in range(100)]))
+        exact = len(a & b) / len(a | b)
+        self.assertAlmostEqual(similarity(signature(a), signature(b)), exact, delta=0.1)
+
+    def test_short_texts_are_not_signed(self):
+        self.assertIsNone(signature(shingles("Python", "2 years")))
+        self.assertIsNotNone(signature(shingles(self.EXPERIENCE)))
+
+    def test_status_changes_do_not_reindex(self):
+        application = self.copies[0]
+        self.client.force_login(self.poster)
+        with mock.patch("jobs.signals.queue_duplicate_indexing") as queue:
+            self.client.post(
+                reverse("update_application_status", args=[application.id]),
+                {"status": "Interview"},
+            )
+            self.client.post(
+                reverse("provide_feedback", args=[application.id]), {"feedback": "Thanks"}
+            )
+        queue.assert_not_called()
+        application.refresh_from_db()
+        self.assertEqual((application.status, application.feedback), ("Interview", "Thanks"))
+
+    def test_flags_clusters_of_near_duplicates(self):
+        applications = list(JobApplication.objects.filter(job=self.job).order_by("pk"))
+        with self.assertNumQueries(1):
+            clusters = flag_duplicates(self.job, applications)
+        self.assertEqual(
+            [sorted(a.pk for a in cluster) for cluster in clusters],
+            [sorted(a.pk for a in self.copies)],
+        )
+        self.assertIsNone(applications[-1].duplicate_group)
+
+    def test_each_duplicate_is_compared_once(self):
+        applications = list(JobApplication.objects.filter(job=self.job))
+        with mock.patch("jobs.duplicates.similarity", wraps=similarity) as compare:
+            flag_duplicates(self.job, applications)
+        # Every copy shares all 16 buckets, but joins its cluster once.
+        self.assertEqual(compare.call_count, len(self.copies) - 1)
+
+    def test_duplicates_behind_an_unrelated_bucket_head_are_found(self):
+        job = create_job(self.poster, title="Bucket Engineer")
+        base = signature(shingles(self.EXPERIENCE))
+        # The head shares only the first band with the copies, and the copies
+        # differ from each other in every later band, so the first band's
+        # bucket is the only place they meet, after the head.
+        head, copy, near_copy = base.copy(), base.copy(), base.copy()
+        head[ROWS:] += 1
+        near_copy[ROWS::ROWS] += 1
+        applications = []
+        for name, sig in (("head", head), ("copy", copy), ("near-copy", near_copy)):
+            user = User.objects.create_user(f"bucket-{name}")
+            application = create_application(job, user, minhash=sig.tobytes())
+            MinHashBucket.objects.bulk_create(
+                MinHashBucket(application=application, job=job, band=band, key=key)
+                for band, key in enumerate(band_keys(sig))
+            )
+            applications.append(application)
+        self.assertGreaterEqual(similarity(copy, near_copy), 0.8)
+
+        clusters = flag_duplicates(job, applications)
+        self.assertEqual(
+            [[a.pk for a in cluster] for cluster in clusters],
+            [[applications[1].pk, applications[2].pk]],
+        )
+        self.assertIsNone(applications[0].duplicate_group)
+
+    def test_applicants_page_shows_duplicates(self):
+        self.client.force_login(self.poster)
+        response = self.client.get(reverse("view_applicants", args=[self.job.id]))
+        self.assertContains(response, "Possible duplicate #1", count=3)
@@ -0,0 +1,194 @@
+import hashlib
+import os
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import StoredFile, UploadSession
+
+CHUNK_SIZE = 1024 * 1024
+MAX_CV_SIZE = 20 * 1024 * 1024
+CV_EXTENSIONS = (".pdf", ".doc", ".docx")
+READ_SIZE = 64 * 1024
+
+# Running hashes of in-flight uploads, keyed by session id. A process that
+# did not see the earlier chunks rebuilds the hash from the partial file.
+_hashers = {}
+_hashers_lock = threading.Lock()
+
+
+def content_name(digest, filename):
+    ext = os.path.splitext(filename)[1].lower()
+    return f"cvs/sha256/{digest[:2]}/{digest}{ext}"
+
+
+def partial_path(session):
+    return os.path.join(settings.UPLOAD_PARTIAL_DIR, str(session.pk))
+
+
+def _acquire(digest, size, filename, source):
+    """
+    Returns the StoredFile for `digest` with one more reference, writing
+    `source` to storage only if the content has not been seen before.
+    """
+    updated = StoredFile.objects.filter(digest=digest).update(
+        ref_count=F("ref_count") + 1
+    )
+    if not updated:
+        try:
+            with transaction.atomic():
+                source.seek(0)
+                name = default_storage.save(content_name(digest, filename), File(source))
+                return StoredFile.objects.create(
+                    digest=digest, file=name, size=size, ref_count=1
+                )
+        except IntegrityError:
+            # Another request stored the same content first.
+            default_storage.delete(name)
+            StoredFile.objects.filter(digest=digest).update(ref_count=F("ref_count") + 1)
+    return StoredFile.objects.get(digest=digest)
+
+
+def store_file(uploaded_file):
+    """
+    Stores an uploaded file by content and returns its StoredFile.
+    """
+    hasher = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        hasher.update(chunk)
+    return _acquire(hasher.hexdigest(), uploaded_file.size, uploaded_file.name, uploaded_file)
+
+
+def release_file(name):
+    """
+    Drops one reference to a stored file, deleting it with the last one.
+    Files that predate content-addressed storage are left alone.
+    """
+    if not name:
+        return
+    with transaction.atomic():
+        stored = StoredFile.objects.select_for_update().filter(file=name).first()
+        if stored is None:
+            return
+        if stored.ref_count > 1:
+            StoredFile.objects.filter(pk=stored.pk).update(ref_count=F("ref_count") - 1)
+            return
+        stored.delete()
+        transaction.on_commit(lambda: default_storage.delete(name))
+
+
+def remove_orphan(name):
+    """
+    Deletes `name` from storage when no StoredFile refers to it, as after a
+    transaction that stored it was rolled back.
+    """
+    if name and not StoredFile.objects.filter(file=name).exists():
+        default_storage.delete(name)
+
+
+def attach_file(instance, field_name, stored):
+    """
+    Points a FileField at a stored file the caller already holds a reference
+    to, and releases the file it pointed at before. Saving is left to the caller.
+    """
+    previous = getattr(instance, field_name).name
+    setattr(instance, field_name, stored.file.name)
+    # When the same content is attached again this drops the extra reference.
+    release_file(previous)
+
+
+def _hasher_for(session):
+    with _hashers_lock:
+        offset, hasher = _hashers.get(session.pk, (None, None))
+    if offset == session.offset:
+        # Copy so a chunk that fails halfway cannot corrupt the cached state.
+        return hasher.copy()
+    hasher = hashlib.sha256()
+    if session.offset:
+        with open(partial_path(session), "rb") as partial:
+            for block in iter(lambda: partial.read(READ_SIZE), b""):
+                hasher.update(block)
+    return hasher
+
+
+def append_chunk(session, stream, offset):
+    """
+    Appends the request body at `offset` to the session's partial file.
+    Returns False when `offset` is not where the upload left off.
+    """
+    if offset != session.offset or session.is_complete:
+        return False
+    hasher = _hasher_for(session)
+    path = partial_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    written = 0
+    with open(path, "ab") as partial:
+        partial.truncate(session.offset)
+        while session.offset + written < session.size:
+            block = stream.read(min(READ_SIZE, session.size - session.offset - written))
+            if not block:
+                break
+            partial.write(block)
+            hasher.update(block)
+            written += len(block)
+    session.offset += written
+    with _hashers_lock:
+        _hashers[session.pk] = (session.offset, hasher)
+    if session.offset == session.size:
+        _finish(session, hasher.hexdigest())
+    else:
+        session.save(update_fields=["offset"])
+    return True
+
+
+def _finish(session, digest):
+    path = partial_path(session)
+    with open(path, "rb") as partial:
+        session.stored_file = _acquire(digest, session.size, session.filename, partial)
+    session.save(update_fields=["offset", "stored_file"])
+    remove_partial(session)
+
+
+def remove_partial(session):
+    with _hashers_lock:
+        _hashers.pop(session.pk, None)
+    try:
+        os.remove(partial_path(session))
+    except FileNotFoundError:
+        pass
+
+
+def discard_session(session):
+    """
+    Deletes an upload session along with its file reference; the partial
+    file goes with it through the post_delete signal.
+    """
+    if session.stored_file_id:
+        release_file(session.stored_file.file.name)
+    session.delete()
+
+
+def claim_session(user, upload_id):
+    """
+    Returns the completed session `upload_id` owned by `user`, or None.
+    """
+    try:
+        return UploadSession.objects.select_related("stored_file").get(
+            pk=upload_id, user=user, stored_file__isnull=False
+        )
+    except (UploadSession.DoesNotExist, ValidationError):
+        return None
+
+
+def consume_session(session):
+    """
+    Deletes a completed session and hands its file reference to the caller.
+    """
+    stored = session.stored_file
+    session.delete()
+    return stored
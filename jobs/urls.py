@@ -15,18 +15,31 @@ urlpatterns = [
     path('dashboard/applicant/profile/', views.applicant_profile_view, name='applicant_profile'),
     path('dashboard/applicant/profile/edit/', views.applicant_profile_edit_view, name='applicant_profile_edit'),
     path('dashboard/applicant/application/<int:application_id>/withdraw/', views.withdraw_application_view, name='withdraw_application'),
+    path('dashboard/applicant/history/', views.applicant_history_view, name='applicant_history'),
+    path('notifications/', views.notifications_view, name='notifications'),
 
     # Employer Dashboard
     path('dashboard/employer/', views.employer_dashboard_view, name='employer_dashboard'),
+    path('dashboard/employer/history/', views.employer_history_view, name='employer_history'),
+    path('dashboard/employer/history/job/<int:job_id>/', views.archived_job_view, name='archived_job'),
     path('dashboard/employer/job/create/', views.create_job_view, name='create_job'),
     path('dashboard/employer/job/<int:job_id>/edit/', views.edit_job_view, name='edit_job'),
     path('dashboard/employer/job/<int:job_id>/delete/', views.delete_job_view, name='delete_job'),
     path('dashboard/employer/job/<int:job_id>/applicants/', views.view_applicants_view, name='view_applicants'),
+    path('dashboard/employer/job/<int:job_id>/applicants/export/', views.export_applicants_view, name='export_applicants'),
+    path('dashboard/employer/job/<int:job_id>/applicants/bulk-update/', views.bulk_update_applications_view, name='bulk_update_applications'),
     path('dashboard/employer/applicant/<int:applicant_id>/profile/', views.view_applicant_profile_view, name='view_applicant_profile'),
     path('dashboard/employer/applicant/<int:application_id>/update/', views.update_application_status_view, name='update_application_status'),
     path('dashboard/employer/applicant/<int:application_id>/feedback/', views.provide_feedback_view, name='provide_feedback'),
     # Profile image management
     path("profile/upload-image/", views.profile_image_upload_view, name="profile_image_upload"),
+    path("profile/image-status/", views.profile_image_status_view, name="profile_image_status"),
     path("profile/remove-image/", views.profile_image_remove_view, name="profile_image_remove"),
     path("profile/upload-cv/", views.cv_upload_view, name="cv_upload"),
+    # Access-controlled downloads
+    path("applications/<int:application_id>/documents/<str:field>/", views.application_document_view, name="application_document"),
+    path("profiles/<int:profile_id>/cv/", views.profile_cv_view, name="profile_cv"),
+    # Resumable uploads
+    path("uploads/", views.upload_create_view, name="upload_create"),
+    path("uploads/<uuid:upload_id>/", views.upload_chunk_view, name="upload_chunk"),
 ]
@@ -1,13 +1,28 @@
+import os
+
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.forms import AuthenticationForm
 from django.core.exceptions import PermissionDenied
-from django.http import Http404, JsonResponse
-from django.shortcuts import get_object_or_404, redirect, render
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
+from django.templatetags.static import static
+from django.urls import reverse
 from django.utils import timezone
+from django.views.decorators.http import require_http_methods, require_POST
+from .cache import cache_anonymous_page
+from .deadlines import is_expired
+from .downloads import serve_protected
+from .duplicates import flag_duplicates
+from .exports import FORMATS as EXPORT_FORMATS, aapplication_rows
 from .forms import (
     ApplicationStatusForm,
+    BulkApplicationUpdateForm,
     FeedbackForm,
     JobApplicationForm,
     JobForm,
@@ -15,10 +30,49 @@ from .forms import (
     ProfileImageForm,
     UserRegistrationForm,
 )
-from .models import JobApplication, JobPosition, Notification, Profile
+from .images import delete_renditions, is_processing, processing_error, queue_profile_picture
+from .matching import annotate_match_scores, sort_by_match
+from .models import (
+    ArchivedJobApplication,
+    ArchivedJobPosition,
+    CVDocument,
+    JobApplication,
+    JobPosition,
+    Notification,
+    Profile,
+    UploadSession,
+)
+from .pagination import apaginate_keyset, apaginate_ranked, get_page_size
+from .routers import read_only_view
+from .search import (
+    FACET_FIELDS,
+    afacet_counts,
+    filter_cv_matching,
+    filter_matching,
+    rank_matching,
+)
+from .uploads import (
+    CHUNK_SIZE,
+    CV_EXTENSIONS,
+    MAX_CV_SIZE,
+    append_chunk,
+    attach_file,
+    claim_session,
+    consume_session,
+    discard_session,
+    release_file,
+    remove_orphan,
+    store_file,
+)
 
 
-# Permission helpers
+NOTIFICATION_LIMIT = 20
+HISTORY_PAGE_SIZE = 20
+DOCUMENT_FIELDS = ("cv_file", "additional_documents")
+
+
+# Permission helpers. ProfileBackend loads the profile with the user, so
+# these checks do not query.
 def is_poster(user):
     return user.is_authenticated and hasattr(user, "profile") and user.profile.role == "POSTER"
 
@@ -29,25 +83,78 @@ def is_applicant(user):
     )
 
 
+async def arender(request, template_name, context):
+    """
+    render() for async views. Querysets should already be evaluated; context
+    processors and templates may still follow lazy relations such as
+    user.profile, so rendering runs off the event loop.
+    """
+    return await sync_to_async(render)(request, template_name, context)
+
+
+async def _request_user(request):
+    """
+    Returns the user already loaded by the async permission decorators and
+    makes request.user the same object, so templates reuse it instead of
+    loading it again.
+    """
+    request.user = await request.auser()
+    return request.user
+
+
 # Home view
-def home_view(request):
+@cache_anonymous_page("home")
+@read_only_view
+async def home_view(request):
     latest_jobs = JobPosition.objects.filter(status="Open").order_by("-created_at")[:5]
-    return render(
+    return await arender(
         request,
         "jobs/home.html",
-        {"latest_jobs": latest_jobs},
+        {"latest_jobs": [job async for job in latest_jobs]},
     )
 
 
 # Job list view
-def job_list_view(request):
-    jobs = JobPosition.objects.filter(status="Open").order_by("-created_at")
-    return render(request, "jobs/job_list.html", {"jobs": jobs})
+@read_only_view
+async def job_list_view(request):
+    open_jobs = JobPosition.objects.filter(status="Open")
+    query = request.GET.get("q", "").strip()
+    filters = {
+        field: request.GET[field] for field in FACET_FIELDS if request.GET.get(field)
+    }
+    page_size = get_page_size(request.GET.get("per_page"))
+    context = {"query": query, "filters": filters}
+
+    if query:
+        # Search mode: ranked results, with each facet counted under the
+        # other active filters so users can switch between values.
+        matching = filter_matching(open_jobs, query)
+        context["facets"] = {
+            field: await afacet_counts(
+                matching.filter(**{k: v for k, v in filters.items() if k != field}),
+                field,
+            )
+            for field in FACET_FIELDS
+        }
+        context["jobs"] = await apaginate_ranked(
+            rank_matching(open_jobs.filter(**filters), query),
+            cursor=request.GET.get("cursor"),
+            page_size=page_size,
+        )
+    else:
+        context["jobs"] = await apaginate_keyset(
+            open_jobs.filter(**filters),
+            cursor=request.GET.get("cursor"),
+            page_size=page_size,
+        )
+    return await arender(request, "jobs/job_list.html", context)
 
 # Job detail view
-def job_detail_view(request, job_id):
-    job = get_object_or_404(JobPosition, id=job_id)
-    return render(request, "jobs/job_detail.html", {"job": job})
+@cache_anonymous_page("job:{job_id}")
+@read_only_view
+async def job_detail_view(request, job_id):
+    job = await aget_object_or_404(JobPosition, id=job_id)
+    return await arender(request, "jobs/job_detail.html", {"job": job})
 
 
 # User registration view
@@ -94,70 +201,141 @@ def logout_view(request):
     return redirect("home")
 
 
+def _already_applied(request):
+    messages.warning(request, "You have already applied for this position.")
+    return redirect("job_list")
+
+
 # Job application view
 @user_passes_test(is_applicant)
 def apply_for_job_view(request, job_id):
     job = get_object_or_404(JobPosition, id=job_id)
-    if JobApplication.objects.filter(applicant=request.user, job=job).exists():
-        messages.warning(request, "You have already applied for this position.")
+    if job.status != "Open" or is_expired(job):
+        messages.error(request, "This position is no longer accepting applications.")
         return redirect("job_list")
     if request.method == "POST":
-        form = JobApplicationForm(request.POST, request.FILES)
+        form = JobApplicationForm(request.POST, request.FILES, user=request.user)
         if form.is_valid():
             application = form.save(commit=False)
             application.applicant = request.user
             application.job = job
-            application.save()
+            session = form.cleaned_data["cv_upload"]
+            stored = None
+            # The unique (job, applicant) constraint rejects a second
+            # application, including a simultaneous one. Taking the file
+            # reference in the same transaction as the insert means a
+            # rejected submission rolls it back, leaving the upload session
+            # and reference counts as they were.
+            try:
+                with transaction.atomic():
+                    if session:
+                        stored = consume_session(session)
+                    else:
+                        stored = store_file(form.cleaned_data["cv_file"])
+                    application.cv_file = stored.file.name
+                    application.save()
+            except IntegrityError:
+                if stored is not None:
+                    # Content first written by this submission is not
+                    # referenced by any row once it rolls back.
+                    remove_orphan(stored.file.name)
+                return _already_applied(request)
             messages.success(request, "Your application has been submitted successfully.")
             return redirect("applicant_dashboard")
+    elif JobApplication.objects.filter(applicant=request.user, job=job).exists():
+        return _already_applied(request)
     else:
-        form = JobApplicationForm()
+        form = JobApplicationForm(user=request.user)
     return render(request, "jobs/apply_job.html", {"form": form, "job": job})
 
 
 # Applicant dashboard view
 @user_passes_test(is_applicant)
-def applicant_dashboard_view(request):
-    profile = get_object_or_404(Profile, user=request.user)
-    applications = JobApplication.objects.filter(
-        applicant=request.user, is_active=True
-    ).order_by("-submitted_at")
-    total_applications = applications.count()
-    interviews_scheduled = applications.filter(status="Interview").count()
-    notifications = Notification.objects.filter(recipient=request.user, is_read=False)
+async def applicant_dashboard_view(request):
+    user = await _request_user(request)
+    profile = user.profile
+    applications = (
+        JobApplication.objects.filter(applicant=user, is_active=True)
+        .select_related("job")
+        .order_by("-submitted_at")
+    )
+    total_applications = await applications.acount()
+    interviews_scheduled = await applications.filter(status="Interview").acount()
+    notifications = Notification.objects.filter(recipient=user, is_read=False)
 
     context = {
         "profile": profile,
-        "applications": applications,
+        "applications": [application async for application in applications],
         "total_applications": total_applications,
         "interviews_scheduled": interviews_scheduled,
         "notifications": notifications,
     }
-    return render(request, "jobs/applicant_dashboard.html", context)
+    return await arender(request, "jobs/applicant_dashboard.html", context)
 
 
 # Employer dashboard view
 @user_passes_test(is_poster)
-def employer_dashboard_view(request):
-    jobs = JobPosition.objects.filter(posted_by=request.user).order_by("-created_at")
-    total_jobs = jobs.count()
-    total_applications = JobApplication.objects.filter(job__in=jobs).count()
+async def employer_dashboard_view(request):
     seven_days_ago = timezone.now() - timezone.timedelta(days=7)
-    new_applications = JobApplication.objects.filter(
-        job__in=jobs, submitted_at__gte=seven_days_ago
-    ).count()
-    return render(
+    # Every count comes from one grouped query, however many jobs there are.
+    jobs = (
+        JobPosition.objects.filter(posted_by=await _request_user(request))
+        .annotate(
+            application_count=Count("jobapplication"),
+            new_application_count=Count(
+                "jobapplication",
+                filter=Q(jobapplication__submitted_at__gte=seven_days_ago),
+            ),
+            pending_count=Count(
+                "jobapplication", filter=Q(jobapplication__status="Pending")
+            ),
+            interview_count=Count(
+                "jobapplication", filter=Q(jobapplication__status="Interview")
+            ),
+            accepted_count=Count(
+                "jobapplication", filter=Q(jobapplication__status="Accepted")
+            ),
+            rejected_count=Count(
+                "jobapplication", filter=Q(jobapplication__status="Rejected")
+            ),
+        )
+        .order_by("-created_at")
+    )
+    jobs = [job async for job in jobs]
+    return await arender(
         request,
         "jobs/employer_dashboard.html",
         {
             "jobs": jobs,
-            "total_jobs": total_jobs,
-            "total_applications": total_applications,
-            "new_applications": new_applications,
+            "total_jobs": len(jobs),
+            "total_applications": sum(job.application_count for job in jobs),
+            "new_applications": sum(job.new_application_count for job in jobs),
         },
     )
 
 
+# Unread notifications, newest first
+@login_required
+async def notifications_view(request):
+    unread = Notification.objects.filter(
+        recipient=await _request_user(request), is_read=False
+    )
+    latest = unread.order_by("-created_at")[:NOTIFICATION_LIMIT]
+    return JsonResponse(
+        {
+            "unread_count": await unread.acount(),
+            "notifications": [
+                {
+                    "id": notification.id,
+                    "message": notification.message,
+                    "created_at": notification.created_at.isoformat(),
+                }
+                async for notification in latest
+            ],
+        }
+    )
+
+
 # Job creation view
 @user_passes_test(is_poster)
 def create_job_view(request):
@@ -204,12 +382,52 @@ def delete_job_view(request, job_id):
 @user_passes_test(is_poster)
 def view_applicants_view(request, job_id):
     job = get_object_or_404(JobPosition, id=job_id, posted_by=request.user)
-    applications = JobApplication.objects.filter(job=job).order_by("-submitted_at")
+    applications = JobApplication.objects.filter(job=job)
+    cv_query = request.GET.get("cv_q", "").strip()
+    if cv_query:
+        matching_cvs = filter_cv_matching(CVDocument.objects.all(), cv_query)
+        applications = applications.filter(cv_file__in=matching_cvs.values("file_name"))
+    applications = list(
+        applications.select_related("applicant__profile").order_by("-submitted_at")
+    )
+    scores = annotate_match_scores(job, applications)
+    duplicate_groups = flag_duplicates(job, applications)
+    sort = request.GET.get("sort")
+    if sort == "match":
+        applications = sort_by_match(applications, scores)
     return render(
         request,
         "jobs/view_applicants.html",
-        {"job": job, "applications": applications},
+        {
+            "job": job,
+            "applications": applications,
+            "sort": sort,
+            "cv_query": cv_query,
+            "bulk_form": BulkApplicationUpdateForm(auto_id="bulk-%s", job=job),
+            "duplicate_groups": duplicate_groups,
+        },
+    )
+
+
+# Export applicants for a job as CSV or JSON Lines
+@user_passes_test(is_poster)
+async def export_applicants_view(request, job_id):
+    job = await aget_object_or_404(
+        JobPosition, id=job_id, posted_by=await _request_user(request)
+    )
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        raise Http404("Unknown export format.")
+    _, aserialize, content_type = EXPORT_FORMATS[export_format]
+    # An async iterator lets the ASGI handler send each chunk as it is
+    # fetched; a sync one would be read into a list before anything is sent.
+    response = StreamingHttpResponse(
+        aserialize(aapplication_rows(job)), content_type=content_type
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="job-{job.id}-applicants.{export_format}"'
     )
+    return response
 
 
 # Update application status view
@@ -222,7 +440,8 @@ def update_application_status_view(request, application_id):
     if request.method == "POST":
         form = ApplicationStatusForm(request.POST, instance=application)
         if form.is_valid():
-            application = form.save()
+            application = form.save(commit=False)
+            application.save(update_fields=["status"])
             Notification.objects.create(
                 recipient=application.applicant,
                 message=f"The status of your application for {application.job.title} has been updated to {application.status}.",
@@ -236,6 +455,50 @@ def update_application_status_view(request, application_id):
     )
 
 
+# Bulk status and feedback update for selected applicants
+@user_passes_test(is_poster)
+@require_POST
+def bulk_update_applications_view(request, job_id):
+    job = get_object_or_404(JobPosition, id=job_id, posted_by=request.user)
+    form = BulkApplicationUpdateForm(request.POST, job=job)
+    if not form.is_valid():
+        for error in form.errors.values():
+            messages.error(request, " ".join(error))
+        return redirect("view_applicants", job_id=job.id)
+
+    status = form.cleaned_data["status"]
+    feedback = form.cleaned_data["feedback"]
+    applications = list(form.cleaned_data["applications"])
+    fields = []
+    if status:
+        fields.append("status")
+    if feedback:
+        fields.append("feedback")
+    for application in applications:
+        if status:
+            application.status = status
+        if feedback:
+            application.feedback = feedback
+
+    if status and feedback:
+        message = f"The status of your application for {job.title} has been updated to {status}, and you have received feedback."
+    elif status:
+        message = f"The status of your application for {job.title} has been updated to {status}."
+    else:
+        message = f"You have received feedback on your application for {job.title}."
+    with transaction.atomic():
+        JobApplication.objects.bulk_update(applications, fields, batch_size=500)
+        Notification.objects.bulk_create(
+            [
+                Notification(recipient_id=application.applicant_id, message=message)
+                for application in applications
+            ],
+            batch_size=500,
+        )
+    messages.success(request, f"Updated {len(applications)} applications.")
+    return redirect("view_applicants", job_id=job.id)
+
+
 # Provide feedback to applicant
 @user_passes_test(is_poster)
 def provide_feedback_view(request, application_id):
@@ -246,7 +509,7 @@ def provide_feedback_view(request, application_id):
     if request.method == "POST":
         form = FeedbackForm(request.POST, instance=application)
         if form.is_valid():
-            form.save()
+            form.save(commit=False).save(update_fields=["feedback"])
             Notification.objects.create(
                 recipient=application.applicant,
                 message=f"You have received feedback on your application for {application.job.title}.",
@@ -260,74 +523,146 @@ def provide_feedback_view(request, application_id):
     )
 
 
-from PIL import Image
-from django.core.files.base import ContentFile
-import io
-
 # Applicant profile management
 @login_required
 def cv_upload_view(request):
     if request.method == "POST":
         profile = request.user.profile
-        profile.cv = request.FILES.get('cv')
+        if request.POST.get("upload_id"):
+            session = claim_session(request.user, request.POST["upload_id"])
+            if session is None:
+                return JsonResponse({"success": False, "errors": "Unknown upload"})
+            stored = consume_session(session)
+        elif 'cv' in request.FILES:
+            stored = store_file(request.FILES['cv'])
+        else:
+            return JsonResponse({"success": False, "errors": "No file uploaded"})
+        attach_file(profile, "cv", stored)
         profile.save()
-        return JsonResponse({"success": True, "cv_url": profile.cv.url})
+        return JsonResponse(
+            {"success": True, "cv_url": reverse("profile_cv", args=[profile.pk])}
+        )
     return JsonResponse({"success": False, "errors": "Invalid request method"})
 
+
+def _upload_state(session):
+    return {
+        "upload_id": str(session.pk),
+        "offset": session.offset,
+        "size": session.size,
+        "complete": session.is_complete,
+        "upload_url": reverse("upload_chunk", args=[session.pk]),
+    }
+
+
+# Resumable uploads: create a session, then PUT the file in chunks, each
+# carrying an Upload-Offset header. GET reports where to resume.
+@login_required
+@require_POST
+def upload_create_view(request):
+    filename = request.POST.get("filename", "")
+    try:
+        size = int(request.POST.get("size", ""))
+    except ValueError:
+        return JsonResponse({"success": False, "errors": "Invalid file size"}, status=400)
+    if not filename.lower().endswith(CV_EXTENSIONS):
+        return JsonResponse(
+            {"success": False, "errors": "Only PDF, DOC, and DOCX files are allowed."},
+            status=400,
+        )
+    if not 0 < size <= MAX_CV_SIZE:
+        return JsonResponse({"success": False, "errors": "File too large"}, status=400)
+    session = UploadSession.objects.create(
+        user=request.user, filename=os.path.basename(filename), size=size
+    )
+    return JsonResponse(
+        {"success": True, "chunk_size": CHUNK_SIZE, **_upload_state(session)}, status=201
+    )
+
+
+@login_required
+@require_http_methods(["GET", "PUT", "DELETE"])
+def upload_chunk_view(request, upload_id):
+    with transaction.atomic():
+        session = get_object_or_404(
+            UploadSession.objects.select_for_update(), pk=upload_id, user=request.user
+        )
+        if request.method == "DELETE":
+            discard_session(session)
+            return JsonResponse({"success": True})
+        if request.method == "PUT":
+            try:
+                offset = int(request.headers.get("Upload-Offset", ""))
+            except ValueError:
+                return JsonResponse(
+                    {"success": False, "errors": "Missing Upload-Offset header"}, status=400
+                )
+            if not append_chunk(session, request, offset):
+                return JsonResponse({"success": False, **_upload_state(session)}, status=409)
+    return JsonResponse({"success": True, **_upload_state(session)})
+
+
+def _profile_image_url(profile):
+    if profile.profile_picture:
+        return profile.profile_picture.url
+    return static("images/default-profile.svg")
+
+
 @login_required
 def profile_image_upload_view(request):
     if request.method == "POST":
-        form = ProfileImageForm(request.POST, request.FILES, instance=request.user.profile)
+        profile = request.user.profile
+        current_url = _profile_image_url(profile)
+        form = ProfileImageForm(request.POST, request.FILES, instance=profile)
         if form.is_valid():
-            profile = form.save(commit=False)
-
             if 'profile_picture' in request.FILES:
-                image = Image.open(request.FILES['profile_picture'])
-
-                # Crop to a square
-                width, height = image.size
-                if width != height:
-                    min_dim = min(width, height)
-                    left = (width - min_dim) / 2
-                    top = (height - min_dim) / 2
-                    right = (width + min_dim) / 2
-                    bottom = (height + min_dim) / 2
-                    image = image.crop((left, top, right, bottom))
-
-                # Resize to 300x300
-                image = image.resize((300, 300), Image.LANCZOS)
-
-                # Save the processed image
-                buffer = io.BytesIO()
-                image.save(buffer, format='PNG')
-                profile.profile_picture.save(request.FILES['profile_picture'].name, ContentFile(buffer.getvalue()))
-
-            profile.save()
-            return JsonResponse({"success": True, "profile_image_url": profile.profile_picture.url})
+                # Cropping and resizing happen on the background pool; the
+                # client polls the status URL until the renditions are live.
+                queue_profile_picture(profile, request.FILES['profile_picture'])
+                return JsonResponse(
+                    {
+                        "success": True,
+                        "pending": True,
+                        "profile_image_url": current_url,
+                        "status_url": reverse("profile_image_status"),
+                    },
+                    status=202,
+                )
+            return JsonResponse({"success": True, "profile_image_url": current_url})
         else:
             return JsonResponse({"success": False, "errors": form.errors})
     return JsonResponse({"success": False, "errors": "Invalid request method"})
 
 
+@login_required
+def profile_image_status_view(request):
+    profile = request.user.profile
+    error = processing_error(profile)
+    return JsonResponse(
+        {
+            "success": not error,
+            "pending": is_processing(profile),
+            "error": error,
+            "profile_image_url": _profile_image_url(profile),
+        }
+    )
+
+
 @login_required
 def profile_image_remove_view(request):
     if request.method == "POST":
         profile = request.user.profile
+        delete_renditions(profile.profile_picture.name)
         profile.profile_picture.delete(save=False)
         profile.profile_picture = None
         profile.save()
-
-        # Get the URL of the default image
-        from django.templatetags.static import static
-        default_image_url = static('images/default-profile.svg')
-
-        return JsonResponse({"success": True, "profile_image_url": default_image_url})
+        return JsonResponse({"success": True, "profile_image_url": _profile_image_url(profile)})
     return JsonResponse({"success": False, "errors": "Invalid request method"})
 
 
 @user_passes_test(is_applicant)
 def applicant_profile_view(request):
-    profile = get_object_or_404(Profile, user=request.user)
+    profile = request.user.profile
     return render(request, "jobs/applicant_profile.html", {"profile": profile})
 
 # View applicant profile (for employers)
@@ -339,11 +674,17 @@ def view_applicant_profile_view(request, applicant_id):
 
 @user_passes_test(is_applicant)
 def applicant_profile_edit_view(request):
-    profile = get_object_or_404(Profile, user=request.user)
+    profile = request.user.profile
+    previous_cv = profile.cv.name
     if request.method == "POST":
         form = ProfileForm(request.POST, request.FILES, instance=profile)
         if form.is_valid():
-            form.save()
+            profile = form.save(commit=False)
+            if "cv" in request.FILES:
+                profile.cv = store_file(request.FILES["cv"]).file.name
+            if "cv" in request.FILES or profile.cv.name != previous_cv:
+                release_file(previous_cv)
+            profile.save()
             messages.success(request, "Profile updated successfully.")
             return redirect("applicant_profile")
     else:
@@ -351,6 +692,81 @@ def applicant_profile_edit_view(request):
     return render(request, "jobs/applicant_profile_edit.html", {"form": form})
 
 
+# Protected downloads
+@login_required
+def application_document_view(request, application_id, field):
+    if field not in DOCUMENT_FIELDS:
+        raise Http404("Unknown document.")
+    application = get_object_or_404(
+        JobApplication.objects.select_related("job"), id=application_id
+    )
+    if request.user.pk not in (application.applicant_id, application.job.posted_by_id):
+        raise PermissionDenied
+    return serve_protected(request, getattr(application, field))
+
+
+@login_required
+def profile_cv_view(request, profile_id):
+    profile = get_object_or_404(Profile, id=profile_id)
+    # Employers may read the CVs of people who applied to their jobs.
+    if profile.user_id != request.user.pk and not JobApplication.objects.filter(
+        applicant_id=profile.user_id, job__posted_by=request.user
+    ).exists():
+        raise PermissionDenied
+    return serve_protected(request, profile.cv)
+
+
+# History pages. Rows moved to the archive are read back from there.
+@user_passes_test(is_applicant)
+def applicant_history_view(request):
+    withdrawn = (
+        JobApplication.objects.filter(applicant=request.user, is_active=False)
+        .select_related("job")
+        .order_by("-submitted_at")
+    )
+    archived = Paginator(
+        ArchivedJobApplication.objects.filter(applicant=request.user).order_by("-submitted_at"),
+        HISTORY_PAGE_SIZE,
+    ).get_page(request.GET.get("page"))
+    return render(
+        request,
+        "jobs/applicant_history.html",
+        {"withdrawn": withdrawn, "archived": archived},
+    )
+
+
+@user_passes_test(is_poster)
+def employer_history_view(request):
+    closed = (
+        JobPosition.objects.filter(posted_by=request.user, status="Closed")
+        .annotate(application_count=Count("jobapplication"))
+        .order_by("-created_at")
+    )
+    archived = Paginator(
+        ArchivedJobPosition.objects.filter(posted_by=request.user).order_by("-created_at"),
+        HISTORY_PAGE_SIZE,
+    ).get_page(request.GET.get("page"))
+    return render(
+        request,
+        "jobs/employer_history.html",
+        {"closed": closed, "archived": archived},
+    )
+
+
+@user_passes_test(is_poster)
+def archived_job_view(request, job_id):
+    job = get_object_or_404(ArchivedJobPosition, id=job_id, posted_by=request.user)
+    applications = Paginator(
+        ArchivedJobApplication.objects.filter(job_id=job.id).order_by("-submitted_at"),
+        HISTORY_PAGE_SIZE,
+    ).get_page(request.GET.get("page"))
+    return render(
+        request,
+        "jobs/archived_job.html",
+        {"job": job, "applications": applications},
+    )
+
+
 # Withdraw application
 @user_passes_test(is_applicant)
 def withdraw_application_view(request, application_id):
@@ -359,7 +775,7 @@ def withdraw_application_view(request, application_id):
     )
     if request.method == "POST":
         application.is_active = False
-        application.save()
+        application.save(update_fields=["is_active"])
         messages.success(request, "Application withdrawn successfully.")
         return redirect("applicant_dashboard")
     return render(request, "jobs/confirm_withdraw.html", {"application": application})
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,7 +47,9 @@ CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
 MIDDLEWARE = [
+    "jobs.profiling.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "jobs.staticfiles.StaticFilesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -59,7 +62,8 @@ ROOT_URLCONF = "recruitment_portal.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates that also times renders for jobs.profiling.
+        "BACKEND": "jobs.profiling.ProfilingTemplates",
         "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -79,10 +83,75 @@ WSGI_APPLICATION = "recruitment_portal.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
+# The database profile is chosen with environment variables. SQLite is the
+# default; DATABASE_ENGINE=postgresql switches to a server database, and
+# DATABASE_REPLICA_HOST adds a "replica" alias that read-only views query
+# (see jobs.routers).
+
+DATABASE_ENGINE = os.environ.get("DATABASE_ENGINE", "sqlite")
+# Seconds a connection is reused across requests; 0 closes it after each one.
+DATABASE_CONN_MAX_AGE = int(os.environ.get("DATABASE_CONN_MAX_AGE", "60"))
+
+if DATABASE_ENGINE == "postgresql":
+    _server_database = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("DATABASE_NAME", "recruitment_portal"),
+        "USER": os.environ.get("DATABASE_USER", ""),
+        "PASSWORD": os.environ.get("DATABASE_PASSWORD", ""),
+        "HOST": os.environ.get("DATABASE_HOST", ""),
+        "PORT": os.environ.get("DATABASE_PORT", ""),
+        "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+    }
+    if os.environ.get("DATABASE_POOL"):
+        # psycopg's connection pool replaces persistent connections.
+        _server_database["CONN_MAX_AGE"] = 0
+        _server_database["OPTIONS"] = {"pool": True}
+    DATABASES = {"default": _server_database}
+    if os.environ.get("DATABASE_REPLICA_HOST"):
+        DATABASES["replica"] = {
+            **_server_database,
+            "HOST": os.environ["DATABASE_REPLICA_HOST"],
+            "TEST": {"MIRROR": "default"},
+        }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+            "OPTIONS": {
+                # Seconds to wait for the write lock instead of failing
+                # with "database is locked".
+                "timeout": 20,
+                # Take the write lock when a transaction starts, so two
+                # writers never deadlock upgrading a read lock.
+                "transaction_mode": "IMMEDIATE",
+                # WAL lets readers run alongside the single writer; NORMAL
+                # sync is durable across application crashes in WAL mode.
+                "init_command": (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    "PRAGMA temp_store=MEMORY;"
+                    "PRAGMA cache_size=-65536;"
+                    "PRAGMA mmap_size=268435456;"
+                ),
+            },
+        }
+    }
+
+DATABASE_ROUTERS = ["jobs.routers.ReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Per-process memory by default. Point this at a shared backend (Redis,
+# Memcached) when running several workers so invalidation reaches them all.
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "recruitment-portal",
     }
 }
 
@@ -124,13 +193,47 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# collectstatic fingerprints file names and writes .gz/.br variants;
+# jobs.staticfiles.StaticFilesMiddleware serves them.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "jobs.staticfiles.CompressedManifestStorage"},
+}
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# How CVs and application documents are sent after the permission check
+# (see jobs.downloads): "django", "x-accel-redirect" (nginx) or "x-sendfile".
+PROTECTED_MEDIA_SERVER = 'django'
+# nginx "internal" location aliased to MEDIA_ROOT, for x-accel-redirect.
+PROTECTED_MEDIA_INTERNAL_URL = '/protected-media/'
+# Folders under MEDIA_ROOT that are only reachable through those views. The
+# front server must not publish them, e.g. with nginx:
+#
+#   location /media/cvs/ { deny all; }
+#   location /media/documents/ { deny all; }
+#   location /protected-media/ { internal; alias /path/to/media/; }
+PROTECTED_MEDIA_PREFIXES = ('cvs/', 'documents/')
+
+# Chunks of resumable uploads are assembled here, outside MEDIA_ROOT.
+UPLOAD_PARTIAL_DIR = BASE_DIR / 'uploads_partial'
+
+# Closed jobs and withdrawn applications older than this many days are moved
+# to the archive tables by the archive_records command.
+ARCHIVE_AFTER_DAYS = 365
+
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# ProfileBackend loads request.user together with its Profile. ModelBackend
+# stays listed so sessions created before it was added still log in.
+AUTHENTICATION_BACKENDS = [
+    'jobs.backends.ProfileBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 LOGIN_REDIRECT_URL = 'applicant_dashboard'
 LOGOUT_REDIRECT_URL = 'home'
 
@@ -154,5 +257,19 @@ LOGGING = {
             'level': 'INFO',
             'propagate': True,
         },
+        'jobs.profiling': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
+
+# Request profiling (jobs.profiling). Fraction of requests to profile; 0 disables it.
+REQUEST_PROFILING_SAMPLE_RATE = 0
+# Slowest queries kept per profiled request, and profiles kept per process.
+REQUEST_PROFILING_SLOW_QUERIES = 5
+REQUEST_PROFILING_BUFFER_SIZE = 200
+
+# Thread pool used for work kept off the request path (image processing, etc.)
+BACKGROUND_TASK_WORKERS = 2
@@ -1,7 +1,10 @@
 from django.contrib import admin
-from django.urls import path, include
+import re
+
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+
+from jobs.downloads import serve_public_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -9,7 +12,14 @@ urlpatterns = [
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    # CVs and application documents only go out through the access-checked
+    # download views, so the development media route refuses their folders.
+    urlpatterns += [
+        re_path(
+            rf"^{re.escape(settings.MEDIA_URL.lstrip('/'))}(?P<path>.*)$",
+            serve_public_media,
+        ),
+    ]
 
 handler400 = 'jobs.views.custom_400_view'
 handler403 = 'jobs.views.custom_403_view'